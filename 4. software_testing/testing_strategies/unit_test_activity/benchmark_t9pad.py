@@ -0,0 +1,201 @@
+"""
+Throughput benchmarks for T9Pad.
+
+Every benchmark runs at several corpus sizes and reports operations per
+second. Results can be saved as JSON and compared with a stored baseline;
+the script exits with status 1 when any benchmark got slower than the
+baseline by more than the allowed threshold.
+
+    python benchmark_t9pad.py --output baseline.json
+    python benchmark_t9pad.py --baseline baseline.json --threshold 0.25
+"""
+
+import argparse
+import json
+import platform
+import random
+import string
+import sys
+import time
+
+from t9pad import T9Pad
+
+DEFAULT_SIZES = [10**2, 10**3, 10**4, 10**5, 10**6]
+# Letters for pads with more than 26 letters; starts past the surrogates so
+# every code point is a valid character.
+_WIDE_LETTERS = 0x10000
+
+
+def make_words(size, seed=0):
+    """
+    Returns size random lowercase words of 3 to 10 letters.
+    """
+    rng = random.Random(seed)
+    return [
+        "".join(rng.choices(string.ascii_lowercase, k=rng.randint(3, 10)))
+        for _ in range(size)
+    ]
+
+
+def _fill_pad(size):
+    # size distinct letters spread over the ten keys, 100 letters per add_key
+    pad = T9Pad()
+    for start in range(0, size, 100):
+        letters = "".join(
+            chr(_WIDE_LETTERS + i) for i in range(start, min(start + 100, size))
+        )
+        pad.add_key((start // 100) % 10, letters)
+    return pad
+
+
+def bench_add_key(size):
+    _fill_pad(size)
+    return size
+
+
+def bench_get_key_code(size):
+    pad = T9Pad.standard()
+    letters = (string.ascii_lowercase * (size // 26 + 1))[:size]
+    for letter in letters:
+        pad.get_key_code(letter)
+    return size
+
+
+def bench_word_to_t9(size, words):
+    pad = T9Pad.standard()
+    for word in words:
+        pad.word_to_t9(word)
+    return size
+
+
+def bench_words_to_t9(size, words):
+    T9Pad.standard().words_to_t9(words)
+    return size
+
+
+def bench_is_textonym(size, words):
+    pad = T9Pad.standard()
+    for first, second in zip(words[::2], words[1::2]):
+        pad.is_textonym(first, second)
+    return size // 2
+
+
+def bench_str(size, pad):
+    str(pad)
+    return size
+
+
+# name -> (function, what it needs prepared outside the timed section)
+BENCHMARKS = {
+    "add_key": (bench_add_key, None),
+    "get_key_code": (bench_get_key_code, None),
+    "word_to_t9": (bench_word_to_t9, "words"),
+    "words_to_t9": (bench_words_to_t9, "words"),
+    "is_textonym": (bench_is_textonym, "words"),
+    "__str__": (bench_str, "pad"),
+}
+
+
+def run(names, sizes, repeat=3):
+    """
+    Runs the named benchmarks at every size.
+
+    :param names: Benchmark names, keys of BENCHMARKS
+    :param sizes: Corpus sizes
+    :param repeat: Runs per measurement; the fastest one is kept
+    :return: Dictionary of name -> {size as string: operations per second}
+    """
+    results = {}
+    for size in sizes:
+        prepared = {}
+        for name in names:
+            function, needs = BENCHMARKS[name]
+            args = (size,)
+            if needs == "words":
+                prepared.setdefault("words", make_words(size))
+                args += (prepared["words"],)
+            elif needs == "pad":
+                prepared.setdefault("pad", _fill_pad(size))
+                args += (prepared["pad"],)
+
+            best = None
+            for _ in range(repeat):
+                start = time.perf_counter()
+                operations = function(*args)
+                elapsed = max(time.perf_counter() - start, 1e-9)
+                rate = operations / elapsed
+                best = rate if best is None else max(best, rate)
+            results.setdefault(name, {})[str(size)] = best
+            print(f"{name:>14} {size:>9,} {best:>16,.0f} ops/s", flush=True)
+    return results
+
+
+def compare(results, baseline, threshold):
+    """
+    Compares results with a baseline.
+
+    :param results: Output of run()
+    :param baseline: Output of an earlier run()
+    :param threshold: Allowed slowdown, e.g. 0.25 for 25%
+    :return: List of (name, size, baseline ops/s, current ops/s) that regressed
+    """
+    regressions = []
+    for name, rates in results.items():
+        for size, rate in rates.items():
+            expected = baseline.get(name, {}).get(size)
+            if expected is not None and rate < expected * (1 - threshold):
+                regressions.append((name, size, expected, rate))
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Benchmark T9Pad throughput.")
+    parser.add_argument(
+        "--sizes",
+        type=lambda value: [int(size) for size in value.split(",")],
+        default=DEFAULT_SIZES,
+        help="comma-separated corpus sizes (default: 100 to 1,000,000)",
+    )
+    parser.add_argument(
+        "--benchmarks",
+        type=lambda value: value.split(","),
+        default=list(BENCHMARKS),
+        help=f"comma-separated subset of: {', '.join(BENCHMARKS)}",
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--output", help="write the results to this JSON file")
+    parser.add_argument("--baseline", help="JSON file from an earlier --output")
+    parser.add_argument(
+        "--threshold", type=float, default=0.25, help="allowed slowdown (default: 0.25)"
+    )
+    args = parser.parse_args(argv)
+
+    unknown = set(args.benchmarks) - set(BENCHMARKS)
+    if unknown:
+        parser.error(f"unknown benchmarks: {', '.join(sorted(unknown))}")
+
+    results = run(args.benchmarks, args.sizes, args.repeat)
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as file:
+            json.dump(
+                {"python": platform.python_version(), "results": results},
+                file,
+                indent=2,
+            )
+
+    if args.baseline:
+        with open(args.baseline, encoding="utf-8") as file:
+            baseline = json.load(file)["results"]
+        regressions = compare(results, baseline, args.threshold)
+        for name, size, expected, rate in regressions:
+            print(
+                f"REGRESSION {name} at {size}: {rate:,.0f} ops/s, baseline {expected:,.0f} ops/s",
+                file=sys.stderr,
+            )
+        if regressions:
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,136 @@
+def edit_distance(first, second):
+    """
+    Returns the Levenshtein distance between two strings: the number of
+    single-character insertions, deletions or substitutions between them.
+
+    :param first: The first string
+    :param second: The second string
+    :return: The distance
+    """
+    if len(first) < len(second):
+        first, second = second, first
+    previous = list(range(len(second) + 1))
+    for row, char in enumerate(first, start=1):
+        current = [row]
+        for column, other in enumerate(second, start=1):
+            current.append(
+                min(
+                    previous[column] + 1,
+                    current[column - 1] + 1,
+                    previous[column - 1] + (char != other),
+                )
+            )
+        previous = current
+    return previous[-1]
+
+
+class _DigitNode:
+    __slots__ = ("children", "code")
+
+    def __init__(self):
+        self.children = {}
+        # the full T9 sequence if one ends at this node
+        self.code = None
+
+
+class FuzzyT9Index:
+    def __init__(self, pad, words=None):
+        """
+        Constructs an index of words by T9 sequence that also finds sequences
+        within an edit distance of a query, to correct mistyped keys.
+
+        Distinct sequences are stored in a digit trie. A search walks the trie
+        computing one row of the edit-distance table per node and abandons a
+        branch as soon as every entry of its row exceeds max_distance, so
+        shared prefixes are compared once and most of the trie is never
+        visited.
+
+        :param pad: The T9Pad used to encode words
+        :param words: Optional iterable of words to add straight away
+        """
+        self._pad = pad
+        self._root = _DigitNode()
+        # T9 sequence -> list of words, kept in insertion order
+        self._words_by_code = {}
+        self._words = set()
+        if words is not None:
+            self.add_words(words)
+
+    def add_word(self, word):
+        """
+        Adds a single word to the index.
+
+        :param word: The word to add
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        if word in self._words:
+            return
+        code = self._pad.word_to_t9(word)
+        self._words.add(word)
+        words = self._words_by_code.get(code)
+        if words is not None:
+            words.append(word)
+            return
+        self._words_by_code[code] = [word]
+
+        node = self._root
+        for digit in code:
+            child = node.children.get(digit)
+            if child is None:
+                child = node.children[digit] = _DigitNode()
+            node = child
+        node.code = code
+
+    def add_words(self, words):
+        """
+        Adds every word of an iterable to the index.
+
+        :param words: Iterable of words
+        :raises ValueError: If a word contains a letter that is not on the pad
+        """
+        for word in words:
+            self.add_word(word)
+
+    def __len__(self):
+        """
+        Returns the number of distinct words in the index.
+        """
+        return len(self._words)
+
+    def search(self, digits, max_distance=1):
+        """
+        Returns the words whose T9 sequence is within max_distance edits of digits.
+
+        :param digits: The typed T9 string, e.g. "4653"
+        :param max_distance: The largest edit distance to accept
+        :return: List of (word, distance) pairs, closest first, then by sequence
+        :raises ValueError: If max_distance is negative
+        """
+        if max_distance < 0:
+            raise ValueError("max_distance must not be negative")
+        matches = []
+        # (node, edit distances from the node's prefix to every prefix of digits)
+        stack = [(self._root, list(range(len(digits) + 1)))]
+        while stack:
+            node, previous = stack.pop()
+            if node.code is not None and previous[-1] <= max_distance:
+                matches.append((previous[-1], node.code))
+            for digit, child in node.children.items():
+                row = [previous[0] + 1]
+                for column, typed in enumerate(digits, start=1):
+                    row.append(
+                        min(
+                            row[column - 1] + 1,
+                            previous[column] + 1,
+                            previous[column - 1] + (typed != digit),
+                        )
+                    )
+                if min(row) <= max_distance:
+                    stack.append((child, row))
+
+        matches.sort()
+        return [
+            (word, distance)
+            for distance, code in matches
+            for word in self._words_by_code[code]
+        ]
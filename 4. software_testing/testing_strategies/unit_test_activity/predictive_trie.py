@@ -0,0 +1,104 @@
+class _TrieNode:
+    # one node per digit prefix; many are created, so keep them small
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        # [frequency, word] pairs, most frequent first
+        self.top = []
+
+
+class PredictiveTrie:
+    def __init__(self, pad, k=5, words=None):
+        """
+        Constructs a digit-keyed trie for predictive T9 input.
+        Every node keeps the k most frequent words whose T9 sequence starts
+        with the node's digit prefix, so a completion only walks the prefix.
+
+        :param pad: The T9Pad used to encode words
+        :param k: How many candidates each prefix keeps
+        :param words: Optional iterable of words; each occurrence counts once
+        :raises ValueError: If k is not a positive number
+        """
+        if k < 1:
+            raise ValueError("k must be at least 1")
+        self._pad = pad
+        self._k = k
+        self._root = _TrieNode()
+        self._frequency = {}
+        if words is not None:
+            self.add_words(words)
+
+    def add_word(self, word, count=1):
+        """
+        Adds count occurrences of word to the trie.
+
+        :param word: The word to add
+        :param count: How many times the word was seen (must be positive)
+        :raises ValueError: If count is not positive or the word is not on the pad
+        """
+        if count < 1:
+            raise ValueError("count must be at least 1")
+        code = self._pad.word_to_t9(word)
+        frequency = self._frequency.get(word, 0) + count
+        self._frequency[word] = frequency
+
+        node = self._root
+        self._offer(node, word, frequency)
+        for digit in code:
+            child = node.children.get(digit)
+            if child is None:
+                child = node.children[digit] = _TrieNode()
+            node = child
+            self._offer(node, word, frequency)
+
+    def add_words(self, words):
+        """
+        Adds every word of an iterable, counting repeated words.
+
+        :param words: Iterable of words
+        """
+        for word in words:
+            self.add_word(word)
+
+    def _offer(self, node, word, frequency):
+        # Frequencies only ever grow, so a word that is not in the top list
+        # only has to beat the weakest entry to get in.
+        top = node.top
+        for entry in top:
+            if entry[1] == word:
+                entry[0] = frequency
+                break
+        else:
+            if len(top) < self._k:
+                top.append([frequency, word])
+            elif (-frequency, word) < (-top[-1][0], top[-1][1]):
+                top[-1] = [frequency, word]
+            else:
+                return
+        top.sort(key=lambda entry: (-entry[0], entry[1]))
+
+    def frequency(self, word):
+        """
+        Returns how many times word was added.
+
+        :param word: The word to look up
+        :return: The frequency, 0 if the word is unknown
+        """
+        return self._frequency.get(word, 0)
+
+    def complete(self, digits, limit=None):
+        """
+        Returns the most frequent words whose T9 sequence starts with digits.
+
+        :param digits: The digits typed so far, e.g. "46"
+        :param limit: Optional maximum number of candidates (at most k)
+        :return: List of words, most frequent first (ties in alphabetical order)
+        """
+        node = self._root
+        for digit in digits:
+            node = node.children.get(digit)
+            if node is None:
+                return []
+        words = [word for _, word in node.top]
+        return words if limit is None else words[:limit]
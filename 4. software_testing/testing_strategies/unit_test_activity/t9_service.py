@@ -0,0 +1,322 @@
+import argparse
+import asyncio
+import json
+import sys
+from itertools import islice
+
+from t9pad import T9Pad
+from textonym_index import TextonymIndex
+from textonym_stream import read_words
+
+
+class T9Service:
+    def __init__(
+        self,
+        pad,
+        index=None,
+        max_batch=512,
+        max_delay=0.001,
+        max_pending=10000,
+        decode_limit=100,
+    ):
+        """
+        Constructs an asyncio front end for a pad that collects concurrent
+        requests into micro-batches. All encode requests of a batch are
+        converted with a single words_to_t9 call and the results are handed
+        back to each caller's future.
+
+        Call start() inside a running event loop before sending requests.
+
+        :param pad: The pad used to encode and decode
+        :param index: Optional TextonymIndex for dictionary decoding and textonyms
+        :param max_batch: The most requests handled in one batch
+        :param max_delay: Seconds to wait for more requests once one arrived
+        :param max_pending: Queued requests before callers have to wait
+        :param decode_limit: The most combinations returned by decode
+        """
+        self._pad = pad
+        self._index = index
+        self._max_batch = max_batch
+        self._max_delay = max_delay
+        self._max_pending = max_pending
+        self._decode_limit = decode_limit
+        self._queue = None
+        self._worker = None
+        # requests taken off the queue and not answered yet
+        self._batch = []
+        self.batches = 0
+        self.requests = 0
+
+    async def start(self):
+        if self._worker is None:
+            self._queue = asyncio.Queue(maxsize=self._max_pending)
+            self._worker = asyncio.create_task(self._run())
+
+    async def close(self):
+        if self._worker is not None:
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+            # callers whose requests were taken off the queue or are still
+            # waiting in it would otherwise hang
+            for _, _, future in self._batch:
+                future.cancel()
+            self._batch = []
+            self._cancel_queued(self._queue)
+            # callers still blocked in put() see this and cancel themselves
+            self._queue = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.close()
+
+    async def encode(self, word):
+        """
+        Returns the T9 sequence of word.
+
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        return await self._submit("encode", word)
+
+    async def decode(self, digits):
+        """
+        Returns the words for digits: the dictionary words if the service has
+        an index, otherwise the first decode_limit letter combinations.
+
+        :raises ValueError: If digits contain a key that is not on the pad
+        """
+        return await self._submit("decode", digits)
+
+    async def textonyms(self, word):
+        """
+        Returns the other dictionary words with the same T9 sequence as word.
+
+        :raises ValueError: If the service has no index or the word can't be encoded
+        """
+        return await self._submit("textonyms", word)
+
+    async def handle(self, request):
+        """
+        Answers one protocol request, {"id": ..., "op": ..., "arg": ...}.
+
+        :param request: The decoded JSON request
+        :return: {"id": ..., "result": ...} or {"id": ..., "error": ...}
+        """
+        request_id = request.get("id") if isinstance(request, dict) else None
+        try:
+            if not isinstance(request, dict):
+                raise ValueError("Request must be a JSON object")
+            operation = request.get("op")
+            if operation not in ("encode", "decode", "textonyms"):
+                raise ValueError(f"Unknown op {operation!r}")
+            argument = request.get("arg")
+            if not isinstance(argument, str):
+                raise ValueError("arg must be a string")
+            return {"id": request_id, "result": await self._submit(operation, argument)}
+        except ValueError as error:
+            return {"id": request_id, "error": str(error)}
+
+    async def _submit(self, operation, argument):
+        if self._worker is None:
+            raise RuntimeError("T9Service.start() has not been called")
+        future = asyncio.get_running_loop().create_future()
+        queue = self._queue
+        await queue.put((operation, argument, future))
+        if queue is not self._queue:
+            # the service closed while we waited for room in the queue;
+            # emptying it lets the callers queued up behind us fail too
+            self._cancel_queued(queue)
+        return await future
+
+    @staticmethod
+    def _cancel_queued(queue):
+        while not queue.empty():
+            queue.get_nowait()[2].cancel()
+
+    async def _run(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            self._batch = batch = [await self._queue.get()]
+            deadline = loop.time() + self._max_delay
+            while len(batch) < self._max_batch:
+                if self._queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self._queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self._queue.get_nowait())
+            try:
+                self._process(batch)
+            except Exception as error:
+                # never let one batch stop the worker
+                for _, _, future in batch:
+                    if not future.done():
+                        future.set_exception(error)
+            self._batch = []
+
+    def _process(self, batch):
+        self.batches += 1
+        self.requests += len(batch)
+        encodes = [item for item in batch if item[0] == "encode"]
+        if encodes:
+            self._encode_batch(encodes)
+        for operation, argument, future in batch:
+            if operation == "encode" or future.done():
+                continue
+            try:
+                if operation == "decode":
+                    result = self._decode(argument)
+                else:
+                    result = self._textonyms(argument)
+            except Exception as error:
+                future.set_exception(error)
+            else:
+                future.set_result(result)
+
+    def _encode_batch(self, encodes):
+        words = [argument for _, argument, _ in encodes]
+        try:
+            codes = self._pad.words_to_t9(words)
+        except Exception:
+            # at least one bad word: fall back to one call per word so only
+            # its caller gets the error
+            codes = []
+            for word in words:
+                try:
+                    codes.append(self._pad.word_to_t9(word))
+                except Exception as error:
+                    codes.append(error)
+        for (_, _, future), code in zip(encodes, codes):
+            if future.done():
+                continue
+            if isinstance(code, Exception):
+                future.set_exception(code)
+            else:
+                future.set_result(code)
+
+    def _decode(self, digits):
+        if self._index is not None:
+            return self._index.words_for(digits)
+        return list(islice(self._pad.decode(digits), self._decode_limit))
+
+    def _textonyms(self, word):
+        if self._index is None:
+            raise ValueError("This service has no word index")
+        return self._index.textonyms_of(word)
+
+
+async def _answer(service, line, write):
+    try:
+        request = json.loads(line)
+    except ValueError:
+        response = {"id": None, "error": "Invalid JSON"}
+    else:
+        response = await service.handle(request)
+    await write(json.dumps(response) + "\n")
+
+
+async def _serve_lines(service, reader, write):
+    # every request line is answered as soon as it is ready, so responses
+    # may come back out of order; clients match them by id
+    pending = set()
+    while True:
+        line = await reader.readline()
+        if not line:
+            break
+        if line.strip():
+            task = asyncio.create_task(_answer(service, line, write))
+            pending.add(task)
+            task.add_done_callback(pending.discard)
+    if pending:
+        await asyncio.gather(*pending)
+
+
+async def serve_socket(service, path):
+    """
+    Serves the JSON-lines protocol on a Unix socket until cancelled.
+
+    :param service: A started T9Service
+    :param path: The socket path
+    """
+
+    async def handle_client(reader, writer):
+        async def write(text):
+            writer.write(text.encode())
+            # wait while a slow client's buffer is full instead of growing it
+            await writer.drain()
+
+        try:
+            await _serve_lines(service, reader, write)
+        finally:
+            writer.close()
+
+    server = await asyncio.start_unix_server(handle_client, path=path)
+    async with server:
+        await server.serve_forever()
+
+
+async def serve_stdio(service):
+    """
+    Serves the JSON-lines protocol on stdin/stdout until stdin is closed.
+
+    :param service: A started T9Service
+    """
+    loop = asyncio.get_running_loop()
+    reader = asyncio.StreamReader()
+    await loop.connect_read_pipe(
+        lambda: asyncio.StreamReaderProtocol(reader), sys.stdin
+    )
+
+    async def write(text):
+        sys.stdout.write(text)
+        sys.stdout.flush()
+
+    await _serve_lines(service, reader, write)
+
+
+async def _main(args):
+    pad = T9Pad.standard()
+    index = None
+    if args.words:
+        index = TextonymIndex(pad)
+        for word in read_words(args.words):
+            try:
+                index.add_word(word.lower())
+            except ValueError:
+                pass
+    async with T9Service(
+        pad, index, max_batch=args.max_batch, max_delay=args.max_delay
+    ) as service:
+        if args.socket:
+            await serve_socket(service, args.socket)
+        else:
+            await serve_stdio(service)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description='Serve T9 requests as JSON lines, e.g. {"id": 1, "op": "encode", "arg": "home"}.'
+    )
+    parser.add_argument(
+        "--socket", help="listen on this Unix socket instead of stdin/stdout"
+    )
+    parser.add_argument("--words", help="word file for decode and textonyms lookups")
+    parser.add_argument("--max-batch", type=int, default=512)
+    parser.add_argument("--max-delay", type=float, default=0.001, help="seconds")
+    asyncio.run(_main(parser.parse_args(argv)))
+
+
+if __name__ == "__main__":
+    main()
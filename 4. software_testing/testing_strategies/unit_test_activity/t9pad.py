@@ -1,3 +1,7 @@
+from collections import OrderedDict
+from functools import lru_cache
+
+
 class T9Pad:
     def __init__(self, pad=None):
         """
@@ -6,6 +10,31 @@ class T9Pad:
         via the method add_key(key, letters).
         """
         self._pad = pad if pad is not None else {}
+        # reverse index: letter -> key, so lookups don't scan every key's set
+        self._key_of = {}
+        for key, letters in self._pad.items():
+            for letter in letters:
+                self._key_of.setdefault(letter, key)
+        # translation tables used by words_to_t9, built on first use
+        self._table = None
+        # optional word_to_t9 cache, see enable_cache()
+        self._cache = None
+        # callbacks told which letters changed key, see add_listener()
+        self._listeners = []
+
+    @classmethod
+    def standard(cls):
+        """
+        Constructs a pad with the usual phone layout (2:abc ... 9:wxyz).
+
+        :return: A new T9Pad
+        """
+        pad = cls()
+        for key, letters in enumerate(
+            ["abc", "def", "ghi", "jkl", "mno", "pqrs", "tuv", "wxyz"], start=2
+        ):
+            pad.add_key(key, letters)
+        return pad
 
     def add_key(self, key, letters):
         """
@@ -19,14 +48,98 @@ class T9Pad:
         if letters is None or key is None or not (0 <= key <= 9):
             raise ValueError("Invalid arguments")
 
-        current_letters = self._pad.get(key, set())
         for letter in letters:
-            # early return
-            if letter in self.get_pad_letters():
+            # early return, before anything is changed
+            if letter in self._key_of:
                 raise ValueError(f"Letter '{letter}' already exists in the pad")
-            # add letter to the pad
+
+        current_letters = self._pad.get(key, set())
+        for letter in letters:
+            # add letter to the pad and to the reverse index
             current_letters.add(letter)
+            self._key_of[letter] = key
         self._pad[key] = current_letters
+        self._changed(set(letters))
+
+    def remove_key(self, key):
+        """
+        Removes a numeric key and all of its letters from the pad.
+
+        :param key: The numeric key
+        :raises ValueError: If the key is not on the pad
+        """
+        if key not in self._pad:
+            raise ValueError(f"Key '{key}' not found in the pad")
+        letters = self._pad.pop(key)
+        for letter in letters:
+            del self._key_of[letter]
+        self._changed(letters)
+
+    def move_letter(self, letter, key):
+        """
+        Moves a letter that is already on the pad to another numeric key.
+
+        :param letter: The letter to move
+        :param key: The numeric key it should map to
+        :raises ValueError: If the key is invalid or the letter is not on the pad
+        """
+        if letter not in self._key_of:
+            raise ValueError(f"Letter '{letter}' not found in the pad")
+        self.remap({letter: key})
+
+    def remap(self, mapping):
+        """
+        Maps every letter of mapping to its new key in one step. Letters that
+        are not on the pad yet are added. Only letters whose key actually
+        changes are reported to caches and listeners.
+
+        :param mapping: Dictionary of letter -> numeric key
+        :raises ValueError: If a key is invalid (nothing is changed then)
+        """
+        for letter, key in mapping.items():
+            if letter is None or key is None or not (0 <= key <= 9):
+                raise ValueError("Invalid arguments")
+
+        changed = set()
+        for letter, key in mapping.items():
+            old_key = self._key_of.get(letter)
+            if old_key == key:
+                continue
+            if old_key is not None:
+                self._pad[old_key].discard(letter)
+                if not self._pad[old_key]:
+                    del self._pad[old_key]
+            self._pad.setdefault(key, set()).add(letter)
+            self._key_of[letter] = key
+            changed.add(letter)
+        if changed:
+            self._changed(changed)
+
+    def add_listener(self, callback):
+        """
+        Registers a callback that is called with the set of letters whose key
+        changed after every add_key, remove_key, move_letter or remap.
+
+        :param callback: Function taking a set of letters
+        """
+        if callback not in self._listeners:
+            self._listeners.append(callback)
+
+    def remove_listener(self, callback):
+        """
+        Unregisters a callback added with add_listener.
+
+        :param callback: The callback to remove
+        """
+        if callback in self._listeners:
+            self._listeners.remove(callback)
+
+    def _changed(self, letters):
+        self._table = None
+        if self._cache is not None:
+            self._cache.discard_containing(letters)
+        for callback in list(self._listeners):
+            callback(letters)
 
     def __str__(self):
         """
@@ -34,7 +147,7 @@ class T9Pad:
         """
         output = "<T9Pad:\n"
         for key, letters in self._pad.items():
-            output += f"{key}:{''.join(letters)}\n"
+            output += f"{key}:{''.join(sorted(letters))}\n"
         output += ">"
         return output
 
@@ -57,6 +170,15 @@ class T9Pad:
             letters.extend(self._pad[key])
         return letters
 
+    def get_key_letters(self, key):
+        """
+        Returns the letters mapped to a numeric key.
+
+        :param key: The numeric key
+        :return: Set of letters (empty if the key is not used)
+        """
+        return set(self._pad.get(key, ()))
+
     def get_key_code(self, letter):
         """
         Finds the numeric key corresponding to the given letter.
@@ -65,11 +187,11 @@ class T9Pad:
         :return: The numeric key
         :raises ValueError: If the letter is not found
         """
-        for key, letters in self._pad.items():
-            # if self.pad.add_key(2, "abc") and a letter is "a", return 2
-            if letter in letters:
-                return key
-        raise ValueError(f"Letter '{letter}' not found in the pad")
+        # if self.pad.add_key(2, "abc") and a letter is "a", return 2
+        try:
+            return self._key_of[letter]
+        except KeyError:
+            raise ValueError(f"Letter '{letter}' not found in the pad") from None
 
     def is_textonym(self, word1, word2):
         """
@@ -87,9 +209,453 @@ class T9Pad:
 
         :param word: The word to convert
         :return: The T9 string representation
+        :raises ValueError: If word is not a string or contains a letter that
+            is not on the pad
         """
+        # checked before the cache, which would fail on unhashable words
+        if not isinstance(word, str):
+            _raise_invalid(self, word)
+        cache = self._cache
+        if cache is not None:
+            code = cache.get(word)
+            if code is None:
+                code = self._encode(word)
+                cache.put(word, code)
+            return code
+        return self._encode(word)
+
+    def _encode(self, word):
+        key_of = self._key_of
         output = []
         # if word is "good", output = ["4", "6", "6", "3"]
         for letter in word:
-            output.append(str(self.get_key_code(letter)))
+            if letter not in key_of:
+                raise ValueError(f"Letter '{letter}' not found in the pad")
+            output.append(str(key_of[letter]))
         return "".join(output)
+
+    def decode(self, digits, words=None, prefixes=None):
+        """
+        Lazily yields every letter combination the pad can produce for digits,
+        the inverse of word_to_t9. Combinations come in alphabetical order.
+
+        With words, only those words are yielded; with prefixes, any branch
+        whose letters so far are not in prefixes is cut as soon as it is
+        reached, so pruned decoding never walks the full cartesian product.
+
+        Passing words alone builds a prefix set from them, which costs time
+        proportional to the whole dictionary, except for a frozenset, whose
+        prefix set is built once and cached. For repeated lookups pass a
+        frozenset, or prefixes=prefix_set(words) along with words.
+
+        :param digits: The T9 string, e.g. "4663"
+        :param words: Optional set of words to restrict the output to; other
+            iterables are copied into a set first
+        :param prefixes: Optional container of allowed prefixes, e.g. from prefix_set()
+        :return: Generator of strings
+        :raises ValueError: If digits contain a key that is not on the pad
+        """
+        return _decode(self, digits, words, prefixes)
+
+    def enable_cache(self, maxsize=4096):
+        """
+        Starts memoizing word_to_t9 in a least-recently-used cache.
+        When a letter changes key, cached words containing it are dropped.
+
+        :param maxsize: The maximum number of cached words
+        :raises ValueError: If maxsize is not positive
+        """
+        if maxsize < 1:
+            raise ValueError("maxsize must be at least 1")
+        self._cache = _LRUCache(maxsize)
+
+    def disable_cache(self):
+        """
+        Stops memoizing word_to_t9 and drops the cache.
+        """
+        self._cache = None
+
+    def cache_info(self):
+        """
+        Returns the counters of the word_to_t9 cache.
+
+        :return: Dictionary with hits, misses, evictions, size and maxsize,
+            or None if the cache is not enabled
+        """
+        return None if self._cache is None else self._cache.info()
+
+    def words_to_t9(self, words):
+        """
+        Converts many words to their T9 representations in one pass.
+        Accepts any iterable of strings, a NumPy array or a pandas Series and
+        returns the same kind of container (a list for plain iterables).
+
+        :param words: The words to convert
+        :return: The T9 strings, in the same order as words
+        :raises ValueError: If a word contains a letter that is not on the pad
+        """
+        return _words_to_t9(self, words, *self._translation_tables())
+
+    def _translation_tables(self):
+        # (str table, 256-entry bytes table or None). Both map every letter to
+        # its key digit; digits that are not letters on the pad map to "?" so
+        # they can't pass for a valid T9 sequence.
+        if self._table is None:
+            table = {ord(digit): "?" for digit in "0123456789"}
+            for letter, key in self._key_of.items():
+                if len(letter) == 1:
+                    table[ord(letter)] = str(key)
+
+            byte_table = None
+            if "\n" not in self._key_of and all(code < 256 for code in table):
+                byte_table = bytearray(b"?" * 256)
+                byte_table[ord("\n")] = ord("\n")
+                for code, digit in table.items():
+                    byte_table[code] = ord(digit)
+                byte_table = bytes(byte_table)
+            self._table = (table, byte_table)
+        return self._table
+
+    def freeze(self):
+        """
+        Returns an immutable, array-backed copy of the pad.
+
+        :return: A FrozenT9Pad with the same mapping
+        :raises ValueError: If a letter is not a single character below U+10000
+        """
+        return FrozenT9Pad.from_mapping(self._key_of)
+
+
+class _LRUCache:
+    # word -> T9 string, least recently used first
+    def __init__(self, maxsize):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, word):
+        code = self._entries.get(word)
+        if code is None:
+            self.misses += 1
+        else:
+            self.hits += 1
+            self._entries.move_to_end(word)
+        return code
+
+    def put(self, word, code):
+        self._entries[word] = code
+        if len(self._entries) > self.maxsize:
+            self._entries.popitem(last=False)
+            self.evictions += 1
+
+    def discard_containing(self, letters):
+        stale = [word for word in self._entries if not letters.isdisjoint(word)]
+        for word in stale:
+            del self._entries[word]
+
+    def info(self):
+        return {
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "size": len(self._entries),
+            "maxsize": self.maxsize,
+        }
+
+
+class FrozenT9Pad:
+    # A lookup table indexed by character code: b"0"..b"9" for letters on the
+    # pad, 0xFF for anything else. Immutable and hashable, so one instance can
+    # be shared between threads or pickled cheaply into worker processes.
+    __slots__ = ("_table", "_hash")
+
+    _UNMAPPED = 0xFF
+
+    def __init__(self, table):
+        """
+        Constructs a frozen pad from a lookup table; use T9Pad.freeze() or
+        FrozenT9Pad.from_mapping() rather than building the table by hand.
+
+        :param table: bytes of length 256 or 65536
+        :raises ValueError: If the table has the wrong size
+        """
+        if not isinstance(table, bytes) or len(table) not in (256, 65536):
+            raise ValueError("table must be 256 or 65536 bytes")
+        object.__setattr__(self, "_table", table)
+        object.__setattr__(self, "_hash", hash(table))
+
+    @classmethod
+    def from_mapping(cls, key_of):
+        """
+        Constructs a frozen pad from a letter -> key mapping.
+
+        :param key_of: Dictionary of letter -> numeric key
+        :return: A new FrozenT9Pad
+        :raises ValueError: If a letter is not a single character below U+10000
+        """
+        codes = {}
+        for letter, key in key_of.items():
+            if len(letter) != 1 or ord(letter) >= 65536:
+                raise ValueError(f"Letter '{letter}' can't be stored in a frozen pad")
+            codes[ord(letter)] = ord(str(key))
+        size = 256 if all(code < 256 for code in codes) else 65536
+        table = bytearray([cls._UNMAPPED]) * size
+        if ord("\n") not in codes:
+            # lets words_to_t9 translate a newline-joined corpus in one call
+            table[ord("\n")] = ord("\n")
+        for code, digit in codes.items():
+            table[code] = digit
+        return cls(bytes(table))
+
+    def __setattr__(self, name, value):
+        raise AttributeError("FrozenT9Pad is immutable")
+
+    def __delattr__(self, name):
+        raise AttributeError("FrozenT9Pad is immutable")
+
+    def __reduce__(self):
+        return (FrozenT9Pad, (self._table,))
+
+    def __eq__(self, other):
+        if not isinstance(other, FrozenT9Pad):
+            return NotImplemented
+        return self._table == other._table
+
+    def __hash__(self):
+        return self._hash
+
+    def _items(self):
+        # (letter, key) pairs in character order
+        table = self._table
+        for code in range(len(table)):
+            if 48 <= table[code] <= 57:
+                yield chr(code), table[code] - 48
+
+    def __str__(self):
+        """
+        Returns a string representation of the pad, keys in ascending order.
+        """
+        letters_of = {}
+        for letter, key in self._items():
+            letters_of.setdefault(key, []).append(letter)
+        output = "<T9Pad:\n"
+        for key in sorted(letters_of):
+            output += f"{key}:{''.join(letters_of[key])}\n"
+        output += ">"
+        return output
+
+    def key_set(self):
+        """
+        Returns the set of keys used on the keypad.
+
+        :return: Set of keys
+        """
+        return {key for _, key in self._items()}
+
+    def get_pad_letters(self):
+        """
+        Returns a list of all letters present in the pad.
+
+        :return: List of letters
+        """
+        return [letter for letter, _ in self._items()]
+
+    def get_key_letters(self, key):
+        """
+        Returns the letters mapped to a numeric key.
+
+        :param key: The numeric key
+        :return: Set of letters (empty if the key is not used)
+        """
+        return {letter for letter, other in self._items() if other == key}
+
+    def get_key_code(self, letter):
+        """
+        Finds the numeric key corresponding to the given letter.
+
+        :param letter: The letter to search for
+        :return: The numeric key
+        :raises ValueError: If the letter is not found
+        """
+        code = ord(letter) if len(letter) == 1 else len(self._table)
+        if code < len(self._table) and 48 <= self._table[code] <= 57:
+            return self._table[code] - 48
+        raise ValueError(f"Letter '{letter}' not found in the pad")
+
+    def is_textonym(self, word1, word2):
+        """
+        Checks if two words are textonyms (map to the same T9 sequence).
+
+        :param word1: The first word
+        :param word2: The second word
+        :return: True if the words are textonyms, False otherwise
+        """
+        return self.word_to_t9(word1) == self.word_to_t9(word2)
+
+    def word_to_t9(self, word):
+        """
+        Converts a word to its T9 representation.
+
+        :param word: The word to convert
+        :return: The T9 string representation
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        # characters past the end of the table are left as they are, which
+        # is never an ASCII digit, so _is_t9 rejects them
+        code = word.translate(self._table)
+        if not _is_t9(code):
+            _raise_invalid(self, word)
+        return code
+
+    def words_to_t9(self, words):
+        """
+        Converts many words to their T9 representations in one pass.
+        See T9Pad.words_to_t9.
+
+        :param words: The words to convert
+        :return: The T9 strings, in the same order as words
+        :raises ValueError: If a word contains a letter that is not on the pad
+        """
+        table = self._table
+        byte_table = table if len(table) == 256 and table[10] == 10 else None
+        return _words_to_t9(self, words, table, byte_table)
+
+    def decode(self, digits, words=None, prefixes=None):
+        """
+        Lazily yields every letter combination for digits. See T9Pad.decode.
+
+        :param digits: The T9 string, e.g. "4663"
+        :param words: Optional set of words to restrict the output to
+        :param prefixes: Optional container of allowed prefixes
+        :return: Generator of strings
+        :raises ValueError: If digits contain a key that is not on the pad
+        """
+        return _decode(self, digits, words, prefixes)
+
+    def thaw(self):
+        """
+        Returns a mutable T9Pad with the same mapping.
+
+        :return: A new T9Pad
+        """
+        pad = T9Pad()
+        for key in sorted(self.key_set()):
+            pad.add_key(key, "".join(sorted(self.get_key_letters(key))))
+        return pad
+
+
+def prefix_set(words):
+    """
+    Returns every prefix of every word, including the empty prefix.
+    Build it once and pass it to decode() to prune many lookups.
+
+    :param words: Iterable of words
+    :return: Set of prefixes
+    """
+    prefixes = set()
+    for word in words:
+        for end in range(len(word), -1, -1):
+            prefix = word[:end]
+            if prefix in prefixes:
+                # shorter prefixes were added along with this one
+                break
+            prefixes.add(prefix)
+    return prefixes
+
+
+def _decode(pad, digits, words, prefixes):
+    # Validated eagerly so a bad key raises here rather than on first next()
+    choices = []
+    for digit in digits:
+        letters = pad.get_key_letters(int(digit)) if digit in "0123456789" else ()
+        if not letters:
+            raise ValueError(f"Key '{digit}' not found in the pad")
+        choices.append(sorted(letters))
+    if words is not None and not isinstance(words, (set, frozenset)):
+        # every finished combination is looked up in words
+        words = set(words)
+    if words is not None and prefixes is None:
+        if isinstance(words, frozenset):
+            prefixes = _cached_prefix_set(words)
+        else:
+            prefixes = prefix_set(word for word in words if len(word) == len(choices))
+    return _combinations(choices, prefixes, words)
+
+
+# prefix sets of the last few frozenset dictionaries given to decode()
+_cached_prefix_set = lru_cache(maxsize=4)(prefix_set)
+
+
+def _combinations(choices, prefixes, words=None):
+    # Depth-first over an explicit stack: memory stays proportional to the
+    # length of digits times the letters per key.
+    if prefixes is not None and "" not in prefixes:
+        return
+    stack = [(0, "")]
+    while stack:
+        depth, prefix = stack.pop()
+        if depth == len(choices):
+            if words is None or prefix in words:
+                yield prefix
+            continue
+        for letter in reversed(choices[depth]):
+            candidate = prefix + letter
+            if prefixes is None or candidate in prefixes:
+                stack.append((depth + 1, candidate))
+
+
+def _words_to_t9(pad, words, table, byte_table):
+    # Shared by T9Pad and FrozenT9Pad. table is anything str.translate accepts,
+    # byte_table a 256-entry bytes table that maps "\n" to itself, or None.
+    is_series = hasattr(words, "str")
+    is_array = not is_series and hasattr(words, "dtype")
+    items = words.tolist() if is_series or is_array else list(words)
+
+    codes = _translate_joined(items, byte_table)
+    if codes is None:
+        codes = []
+        for word in items:
+            code = word.translate(table) if isinstance(word, str) else None
+            if code is None or not _is_t9(code):
+                _raise_invalid(pad, word)
+            codes.append(code)
+
+    if is_series:
+        return type(words)(codes, index=words.index, name=words.name)
+    if is_array:
+        import numpy as np
+
+        return np.array(codes, dtype=str)
+    return codes
+
+
+def _translate_joined(items, byte_table):
+    # Fast path: join the corpus into one string and translate it with a
+    # single bytes.translate call. Returns None whenever that isn't possible
+    # (letters outside Latin-1, a newline on the pad, a non-string item, or an
+    # invalid word), and the caller goes word by word instead.
+    if byte_table is None or not items:
+        return None
+    try:
+        joined = "\n".join(items).encode("latin-1")
+    except (TypeError, UnicodeEncodeError):
+        return None
+    translated = joined.translate(byte_table)
+    if translated.translate(None, b"0123456789\n"):
+        return None
+    codes = translated.decode("ascii").split("\n")
+    return codes if len(codes) == len(items) else None
+
+
+def _raise_invalid(pad, word):
+    if isinstance(word, str):
+        for letter in word:
+            # raises with the offending letter
+            pad.get_key_code(letter)
+    raise ValueError(f"Cannot convert {word!r} to T9")
+
+
+def _is_t9(code):
+    return code == "" or (code.isascii() and code.isdigit())
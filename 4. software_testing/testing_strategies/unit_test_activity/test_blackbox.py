@@ -1,6 +1,8 @@
+import pickle
 import unittest
+from itertools import islice
 
-from t9pad import T9Pad
+from t9pad import FrozenT9Pad, T9Pad, prefix_set
 
 
 class TestT9Pad(unittest.TestCase):
@@ -133,6 +135,11 @@ class TestT9Pad(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.pad.add_key(3, "aef")  # 'a' already exists
 
+        # A rejected call must not leave part of its letters behind
+        with self.assertRaises(ValueError):
+            self.pad.get_key_code("e")
+        self.assertEqual({2}, self.pad.key_set())
+
     def test_key_set_functionality(self):
         """Test the key_set method returns correct set of keys"""
         # Test empty pad key set
@@ -167,6 +174,248 @@ class TestT9Pad(unittest.TestCase):
         with self.assertRaises(ValueError):
             self.pad.word_to_t9("xyz")
 
+    def test_words_to_t9(self):
+        """Test bulk conversion of many words"""
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+        self.pad.add_key(4, "ghi")
+
+        words = ["beg", "", "add", "hi"]
+        expected = [self.pad.word_to_t9(word) for word in words]
+        self.assertEqual(expected, self.pad.words_to_t9(words))
+        self.assertEqual(expected, self.pad.words_to_t9(iter(words)))
+        self.assertEqual([], self.pad.words_to_t9([]))
+
+        # Digits are not letters on this pad
+        with self.assertRaises(ValueError):
+            self.pad.words_to_t9(["beg", "b3g"])
+        with self.assertRaises(ValueError):
+            self.pad.words_to_t9(["beg", "xyz"])
+
+    def test_words_to_t9_containers(self):
+        """Test bulk conversion keeps NumPy and pandas containers"""
+        try:
+            import numpy as np
+            import pandas as pd
+        except ImportError:
+            self.skipTest("numpy and pandas are required")
+
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+
+        codes = self.pad.words_to_t9(np.array(["bad", "fed"]))
+        self.assertIsInstance(codes, np.ndarray)
+        self.assertEqual(["223", "333"], codes.tolist())
+
+        series = pd.Series(["bad", "fed"], index=[10, 20])
+        codes = self.pad.words_to_t9(series)
+        self.assertIsInstance(codes, pd.Series)
+        self.assertEqual([10, 20], list(codes.index))
+        self.assertEqual(["223", "333"], list(codes))
+
+    def test_word_to_t9_cache(self):
+        """Test the optional LRU cache of word_to_t9"""
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+        self.assertIsNone(self.pad.cache_info())
+
+        self.pad.enable_cache(maxsize=2)
+        self.assertEqual("223", self.pad.word_to_t9("bad"))
+        self.assertEqual("223", self.pad.word_to_t9("bad"))
+        self.assertEqual("333", self.pad.word_to_t9("fed"))
+        self.assertEqual("22", self.pad.word_to_t9("ab"))  # evicts "bad"
+        self.assertEqual(
+            {"hits": 1, "misses": 3, "evictions": 1, "size": 2, "maxsize": 2},
+            self.pad.cache_info(),
+        )
+
+        # Errors are not cached
+        with self.assertRaises(ValueError):
+            self.pad.word_to_t9("hi")
+        # Words that are not strings fail the same way with or without the cache
+        for cached in (True, False):
+            if not cached:
+                self.pad.disable_cache()
+            for word in (["b", "a"], 42, None):
+                with self.assertRaises(ValueError):
+                    self.pad.word_to_t9(word)
+        self.pad.enable_cache(maxsize=2)
+        self.pad.word_to_t9("fed")
+        self.pad.word_to_t9("ab")
+        # Moving a letter drops only the cached words containing it
+        self.pad.add_key(4, "ghi")
+        self.assertEqual(2, self.pad.cache_info()["size"])
+        self.pad.move_letter("a", 4)
+        self.assertEqual(1, self.pad.cache_info()["size"])
+        self.assertEqual("42", self.pad.word_to_t9("ab"))
+        self.assertEqual("44", self.pad.word_to_t9("hi"))
+
+        self.pad.disable_cache()
+        self.assertIsNone(self.pad.cache_info())
+        self.assertEqual("44", self.pad.word_to_t9("hi"))
+
+        with self.assertRaises(ValueError):
+            self.pad.enable_cache(maxsize=0)
+
+    def test_decode(self):
+        """Test lazy decoding of a T9 string back to letters"""
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+
+        self.assertEqual(
+            ["ad", "ae", "af", "bd", "be", "bf", "cd", "ce", "cf"],
+            list(self.pad.decode("23")),
+        )
+        self.assertEqual([""], list(self.pad.decode("")))
+        # Lazy: only the requested combinations are produced
+        self.assertEqual(
+            ["aaaaaaaaaaaaaaaaaaaa"], list(islice(self.pad.decode("2" * 20), 1))
+        )
+
+        with self.assertRaises(ValueError):
+            self.pad.decode("24")
+
+    def test_decode_pruned(self):
+        """Test decoding restricted to a dictionary or a prefix set"""
+        pad = T9Pad.standard()
+        words = {"good", "home", "hood", "gone", "go", "hogs"}
+
+        self.assertEqual(
+            ["gone", "good", "home", "hood"], list(pad.decode("4663", words=words))
+        )
+        self.assertEqual([], list(pad.decode("4663", words={"hogs"})))
+        # Other iterables, even one-shot ones, are copied into a set
+        self.assertEqual(
+            ["gone", "good", "home", "hood"],
+            list(pad.decode("4663", words=iter(sorted(words)))),
+        )
+        # A prefix set also accepts partial words
+        prefixes = prefix_set(words)
+        self.assertEqual(
+            ["gon", "goo", "hom", "hoo"], list(pad.decode("466", prefixes=prefixes))
+        )
+        self.assertEqual([], list(pad.decode("999", prefixes=prefixes)))
+        self.assertEqual(["go"], list(pad.freeze().decode("46", words=words)))
+        # A prefix set passed with words is used as is; prefixes of longer
+        # words are not yielded as words
+        self.assertEqual(
+            ["gon", "hom"],
+            list(pad.decode("466", words={"gon", "hom"}, prefixes=prefixes)),
+        )
+        # A frozenset dictionary's prefix set is built once and reused
+        frozen_words = frozenset(words)
+        for _ in range(2):
+            self.assertEqual(
+                ["gone", "good", "home", "hood"],
+                list(pad.decode("4663", words=frozen_words)),
+            )
+        self.assertEqual([], list(pad.decode("466", words=frozen_words)))
+
+    def test_remove_key(self):
+        """Test removing a key and its letters"""
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+        self.pad.remove_key(2)
+
+        self.assertEqual({3}, self.pad.key_set())
+        self.assertEqual("33", self.pad.word_to_t9("fe"))
+        with self.assertRaises(ValueError):
+            self.pad.get_key_code("a")
+        with self.assertRaises(ValueError):
+            self.pad.words_to_t9(["fed", "bad"])
+        # the letters can be added again
+        self.pad.add_key(4, "abc")
+        self.assertEqual("434", self.pad.word_to_t9("bea"))
+
+        with self.assertRaises(ValueError):
+            self.pad.remove_key(2)
+
+    def test_move_letter_and_remap(self):
+        """Test moving letters between keys"""
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "d")
+        self.pad.move_letter("c", 3)
+        self.assertEqual("233", self.pad.word_to_t9("acd"))
+        self.assertEqual({"c", "d"}, self.pad.get_key_letters(3))
+
+        self.pad.remap({"a": 5, "b": 5, "z": 9})
+        self.assertEqual({3, 5, 9}, self.pad.key_set())
+        self.assertEqual(["5539"], self.pad.words_to_t9(["abcz"]))
+
+        with self.assertRaises(ValueError):
+            self.pad.move_letter("q", 2)
+        with self.assertRaises(ValueError):
+            self.pad.remap({"a": 2, "b": 10})
+        self.assertEqual(5, self.pad.get_key_code("a"))
+
+    def test_listeners(self):
+        """Test listeners are told which letters changed key"""
+        changes = []
+        self.pad.add_listener(changes.append)
+        self.pad.add_listener(changes.append)  # registered once
+        self.pad.add_key(2, "abc")
+        self.pad.move_letter("a", 2)  # no change, no call
+        self.pad.remap({"a": 3, "b": 2})
+        self.pad.remove_key(3)
+        self.pad.remove_listener(changes.append)
+        self.pad.add_key(4, "g")
+        self.assertEqual([{"a", "b", "c"}, {"a"}, {"a"}], changes)
+
+
+class TestFrozenT9Pad(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad.standard()
+        self.frozen = self.pad.freeze()
+
+    def test_same_answers_as_pad(self):
+        self.assertIsInstance(self.frozen, FrozenT9Pad)
+        self.assertEqual(4, self.frozen.get_key_code("g"))
+        self.assertEqual("4663", self.frozen.word_to_t9("good"))
+        self.assertEqual("", self.frozen.word_to_t9(""))
+        self.assertTrue(self.frozen.is_textonym("good", "home"))
+        self.assertEqual(["4663", "46"], self.frozen.words_to_t9(["home", "in"]))
+        self.assertEqual(self.pad.key_set(), self.frozen.key_set())
+        self.assertEqual({"p", "q", "r", "s"}, self.frozen.get_key_letters(7))
+        self.assertEqual(
+            sorted(self.pad.get_pad_letters()), self.frozen.get_pad_letters()
+        )
+        self.assertEqual(str(self.pad), str(self.frozen))
+
+    def test_unknown_letters(self):
+        for letter in ("1", "\n", "é", "ж", "😀", "ab"):
+            with self.assertRaises(ValueError):
+                self.frozen.get_key_code(letter)
+        for word in ("go0d", "go\nd", "gœd", "g😀"):
+            with self.assertRaises(ValueError):
+                self.frozen.word_to_t9(word)
+        with self.assertRaises(ValueError):
+            self.frozen.words_to_t9(["good", "g00d"])
+
+    def test_wide_letters(self):
+        pad = T9Pad()
+        pad.add_key(2, "абв")
+        frozen = pad.freeze()
+        self.assertEqual("222", frozen.word_to_t9("ваб"))
+        self.assertEqual(["22", "2"], frozen.words_to_t9(["аб", "в"]))
+        with self.assertRaises(ValueError):
+            frozen.word_to_t9("abc")
+
+    def test_immutable_hashable_picklable(self):
+        with self.assertRaises(AttributeError):
+            self.frozen._table = b""
+        self.assertEqual(self.frozen, T9Pad.standard().freeze())
+        self.assertEqual(hash(self.frozen), hash(T9Pad.standard().freeze()))
+        self.assertEqual(1, len({self.frozen, T9Pad.standard().freeze()}))
+        self.assertEqual(self.frozen, pickle.loads(pickle.dumps(self.frozen)))
+        self.assertFalse(hasattr(self.frozen, "__dict__"))
+
+    def test_thaw(self):
+        pad = self.frozen.thaw()
+        pad.add_key(0, " ")
+        self.assertEqual("4663046", pad.word_to_t9("good in"))
+        with self.assertRaises(ValueError):
+            self.frozen.word_to_t9("good in")
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,76 @@
+import random
+import unittest
+
+from fuzzy_t9_index import FuzzyT9Index, edit_distance
+from t9pad import T9Pad
+
+
+class TestEditDistance(unittest.TestCase):
+    def test_edit_distance(self):
+        self.assertEqual(0, edit_distance("4663", "4663"))
+        self.assertEqual(1, edit_distance("4663", "4653"))  # substitution
+        self.assertEqual(1, edit_distance("4663", "466"))  # deletion
+        self.assertEqual(1, edit_distance("466", "4663"))  # insertion
+        self.assertEqual(4, edit_distance("", "4663"))
+        self.assertEqual(3, edit_distance("kitten", "sitting"))
+
+
+class TestFuzzyT9Index(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad.standard()
+        self.index = FuzzyT9Index(
+            self.pad, ["good", "home", "in", "hood", "go", "hogs", "gone", "good"]
+        )
+
+    def test_exact_search(self):
+        self.assertEqual(7, len(self.index))
+        self.assertEqual(
+            [("good", 0), ("home", 0), ("hood", 0), ("gone", 0)],
+            self.index.search("4663", 0),
+        )
+        self.assertEqual([], self.index.search("2", 0))
+
+    def test_search_within_distance(self):
+        # "4653" is "4663" with one mistyped key
+        self.assertEqual(
+            [("good", 1), ("home", 1), ("hood", 1), ("gone", 1)],
+            self.index.search("4653"),
+        )
+        self.assertEqual(
+            [
+                ("in", 0),
+                ("go", 0),
+                ("hogs", 2),
+                ("good", 2),
+                ("home", 2),
+                ("hood", 2),
+                ("gone", 2),
+            ],
+            self.index.search("46", 2),
+        )
+        with self.assertRaises(ValueError):
+            self.index.search("46", -1)
+
+    def test_matches_brute_force(self):
+        rng = random.Random(0)
+        words = [
+            "".join(rng.choices("abcdefghijklmnopqrstuvwxyz", k=rng.randint(1, 6)))
+            for _ in range(500)
+        ]
+        index = FuzzyT9Index(self.pad, words)
+        for _ in range(20):
+            query = "".join(rng.choices("23456789", k=rng.randint(1, 6)))
+            expected = sorted(
+                {
+                    word
+                    for word in words
+                    if edit_distance(query, self.pad.word_to_t9(word)) <= 2
+                }
+            )
+            self.assertEqual(
+                expected, sorted(word for word, _ in index.search(query, 2))
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
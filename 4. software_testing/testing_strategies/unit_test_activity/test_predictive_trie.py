@@ -0,0 +1,53 @@
+import unittest
+
+from predictive_trie import PredictiveTrie
+from t9pad import T9Pad
+
+
+class TestPredictiveTrie(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad()
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+        self.pad.add_key(4, "ghi")
+        self.pad.add_key(5, "jkl")
+        self.pad.add_key(6, "mno")
+        self.pad.add_key(7, "pqrs")
+        self.pad.add_key(8, "tuv")
+        self.pad.add_key(9, "wxyz")
+
+    def test_complete_ranks_by_frequency(self):
+        trie = PredictiveTrie(self.pad, k=3)
+        trie.add_word("good", 5)
+        trie.add_word("home", 9)
+        trie.add_word("gone", 2)
+        trie.add_word("in", 7)
+
+        # "46" is a prefix of good/home/gone and the whole of "in"
+        self.assertEqual(["home", "in", "good"], trie.complete("46"))
+        self.assertEqual(["home", "good", "gone"], trie.complete("466"))
+        self.assertEqual(["home"], trie.complete("46", limit=1))
+        self.assertEqual([], trie.complete("22"))
+
+    def test_top_k_is_updated_when_frequency_grows(self):
+        trie = PredictiveTrie(self.pad, k=2, words=["good", "good", "home", "gone"])
+        self.assertEqual(["good", "gone"], trie.complete("4663"))
+
+        trie.add_word("hood", 3)
+        self.assertEqual(["hood", "good"], trie.complete("4663"))
+        self.assertEqual(2, trie.frequency("good"))
+        self.assertEqual(0, trie.frequency("bad"))
+
+    def test_invalid_arguments(self):
+        with self.assertRaises(ValueError):
+            PredictiveTrie(self.pad, k=0)
+        trie = PredictiveTrie(self.pad)
+        with self.assertRaises(ValueError):
+            trie.add_word("g00d")
+        with self.assertRaises(ValueError):
+            trie.add_word("good", 0)
+        self.assertEqual([], trie.complete(""))
+
+
+if __name__ == "__main__":
+    unittest.main()
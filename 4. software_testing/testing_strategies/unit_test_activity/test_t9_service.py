@@ -0,0 +1,167 @@
+import asyncio
+import json
+import os
+import tempfile
+import unittest
+
+from t9_service import T9Service, serve_socket
+from t9pad import T9Pad
+from textonym_index import TextonymIndex
+
+
+class TestT9Service(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad.standard()
+        self.index = TextonymIndex(
+            self.pad, ["good", "home", "hood", "gone", "in", "go"]
+        )
+
+    def run_async(self, coroutine):
+        return asyncio.run(coroutine)
+
+    def test_concurrent_encodes_are_batched(self):
+        words = ["good", "home", "in", "hogs"] * 50
+
+        async def scenario():
+            async with T9Service(self.pad, max_batch=64, max_delay=0.01) as service:
+                codes = await asyncio.gather(*(service.encode(word) for word in words))
+                return codes, service.batches
+
+        codes, batches = self.run_async(scenario())
+        self.assertEqual(self.pad.words_to_t9(words), codes)
+        self.assertLessEqual(batches, 10)
+
+    def test_errors_only_reach_their_caller(self):
+        async def scenario():
+            async with T9Service(self.pad) as service:
+                return await asyncio.gather(
+                    service.encode("good"),
+                    service.encode("g00d"),
+                    service.decode("4x"),
+                    service.textonyms("good"),
+                    return_exceptions=True,
+                )
+
+        good, bad_word, bad_digits, no_index = self.run_async(scenario())
+        self.assertEqual("4663", good)
+        self.assertIsInstance(bad_word, ValueError)
+        self.assertIsInstance(bad_digits, ValueError)
+        self.assertIsInstance(no_index, ValueError)
+
+    def test_unexpected_errors_do_not_stop_the_service(self):
+        async def scenario():
+            async with T9Service(self.pad) as service:
+                results = await asyncio.gather(
+                    service.encode(42),
+                    service.decode(None),
+                    return_exceptions=True,
+                )
+                results.append(await asyncio.wait_for(service.encode("good"), 1))
+                return results
+
+        bad_word, bad_digits, good = self.run_async(scenario())
+        self.assertIsInstance(bad_word, ValueError)
+        self.assertIsInstance(bad_digits, TypeError)
+        self.assertEqual("4663", good)
+
+    def test_close_cancels_requests_taken_off_the_queue(self):
+        async def scenario():
+            service = T9Service(self.pad, max_batch=64, max_delay=10)
+            await service.start()
+            request = asyncio.ensure_future(service.encode("good"))
+            # let the worker take the request and wait for more
+            await asyncio.sleep(0.01)
+            await service.close()
+            return await asyncio.wait_for(
+                asyncio.gather(request, return_exceptions=True), 1
+            )
+
+        (result,) = self.run_async(scenario())
+        self.assertIsInstance(result, asyncio.CancelledError)
+
+    def test_close_cancels_callers_waiting_for_room(self):
+        async def scenario():
+            service = T9Service(self.pad, max_pending=1)
+            await service.start()
+            requests = [asyncio.ensure_future(service.encode("good")) for _ in range(4)]
+            # the requests only start once close() yields, so all but the
+            # first block in put() on the full queue
+            await service.close()
+            return await asyncio.wait_for(
+                asyncio.gather(*requests, return_exceptions=True), 1
+            )
+
+        results = self.run_async(scenario())
+        self.assertEqual(4, len(results))
+        for result in results:
+            self.assertIsInstance(result, asyncio.CancelledError)
+
+    def test_decode_and_textonyms(self):
+        async def scenario():
+            async with T9Service(self.pad, self.index) as service:
+                return await service.decode("46"), await service.textonyms("good")
+
+        self.assertEqual(
+            (["in", "go"], ["home", "hood", "gone"]), self.run_async(scenario())
+        )
+
+        async def without_index():
+            async with T9Service(self.pad, decode_limit=2) as service:
+                return await service.decode("46")
+
+        self.assertEqual(["gm", "gn"], self.run_async(without_index()))
+
+    def test_handle_protocol_requests(self):
+        async def scenario():
+            async with T9Service(self.pad, self.index) as service:
+                return [
+                    await service.handle({"id": 1, "op": "encode", "arg": "home"}),
+                    await service.handle({"id": 2, "op": "decode", "arg": "4663"}),
+                    await service.handle({"id": 3, "op": "delete", "arg": "home"}),
+                    await service.handle({"id": 4, "op": "encode", "arg": 42}),
+                    await service.handle(["not", "an", "object"]),
+                ]
+
+        responses = self.run_async(scenario())
+        self.assertEqual({"id": 1, "result": "4663"}, responses[0])
+        self.assertEqual(
+            {"id": 2, "result": ["good", "home", "hood", "gone"]}, responses[1]
+        )
+        self.assertEqual(3, responses[2]["id"])
+        self.assertIn("error", responses[2])
+        self.assertIn("error", responses[3])
+        self.assertEqual(None, responses[4]["id"])
+
+    @unittest.skipUnless(hasattr(asyncio, "start_unix_server"), "needs Unix sockets")
+    def test_serve_socket(self):
+        async def scenario(path):
+            async with T9Service(self.pad, self.index) as service:
+                server = asyncio.create_task(serve_socket(service, path))
+                while not os.path.exists(path):
+                    await asyncio.sleep(0.01)
+                reader, writer = await asyncio.open_unix_connection(path)
+                writer.write(b'{"id": 1, "op": "encode", "arg": "home"}\n')
+                writer.write(b'{"id": 2, "op": "textonyms", "arg": "good"}\n')
+                writer.write_eof()
+                responses = [json.loads(line) async for line in reader]
+                writer.close()
+                server.cancel()
+                return sorted(responses, key=lambda response: response["id"])
+
+        with tempfile.TemporaryDirectory() as directory:
+            responses = self.run_async(scenario(os.path.join(directory, "t9.sock")))
+        self.assertEqual(
+            [
+                {"id": 1, "result": "4663"},
+                {"id": 2, "result": ["home", "hood", "gone"]},
+            ],
+            responses,
+        )
+
+    def test_requires_start(self):
+        with self.assertRaises(RuntimeError):
+            self.run_async(T9Service(self.pad).encode("good"))
+
+
+if __name__ == "__main__":
+    unittest.main()
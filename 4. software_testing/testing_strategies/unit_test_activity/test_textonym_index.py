@@ -0,0 +1,113 @@
+import unittest
+
+from t9pad import T9Pad
+from textonym_index import TextonymIndex
+
+
+class TestTextonymIndex(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad()
+        self.pad.add_key(2, "abc")
+        self.pad.add_key(3, "def")
+        self.pad.add_key(4, "ghi")
+        self.pad.add_key(5, "jkl")
+        self.pad.add_key(6, "mno")
+        self.pad.add_key(7, "pqrs")
+        self.pad.add_key(8, "tuv")
+        self.pad.add_key(9, "wxyz")
+        self.index = TextonymIndex(self.pad, ["good", "home", "hood", "gone", "hogs"])
+
+    def test_words_for(self):
+        self.assertEqual(["good", "home", "hood", "gone"], self.index.words_for("4663"))
+        self.assertEqual(["hogs"], self.index.words_for("4647"))
+        self.assertEqual([], self.index.words_for("222"))
+
+    def test_textonyms_of(self):
+        self.assertEqual(["home", "hood", "gone"], self.index.textonyms_of("good"))
+        self.assertEqual([], self.index.textonyms_of("hogs"))
+        # words that are not indexed can still be looked up
+        self.assertEqual(
+            ["good", "home", "hood", "gone"], self.index.textonyms_of("inne")
+        )
+
+    def test_groups(self):
+        self.assertEqual(
+            {"4663": ["good", "home", "hood", "gone"]}, self.index.groups()
+        )
+        self.assertEqual(2, len(self.index.groups(min_size=1)))
+        self.assertEqual({}, self.index.groups(min_size=5))
+
+    def test_duplicates_and_membership(self):
+        self.index.add_word("good")
+        self.assertEqual(5, len(self.index))
+        self.assertIn("good", self.index)
+        self.assertNotIn("bad", self.index)
+        self.assertEqual("4663", self.index.code_of("good"))
+        self.assertIsNone(self.index.code_of("bad"))
+
+    def test_add_word_error(self):
+        with self.assertRaises(ValueError):
+            self.index.add_word("g00d")
+        self.assertNotIn("g00d", self.index)
+
+    def test_attached_index_follows_remapping(self):
+        self.index.attach()
+        # only the words containing "g" are re-encoded
+        self.pad.move_letter("g", 5)
+        self.assertEqual(["home", "hood"], self.index.words_for("4663"))
+        self.assertEqual(["good", "gone"], self.index.words_for("5663"))
+        self.assertEqual(["hogs"], self.index.words_for("4657"))
+
+        # removing a key drops its words until the letters come back
+        self.pad.remove_key(7)
+        self.assertEqual([], self.index.words_for("4657"))
+        self.assertIsNone(self.index.code_of("hogs"))
+        self.assertIn("hogs", self.index)
+        self.pad.add_key(7, "pqrs")
+        self.assertEqual(["hogs"], self.index.words_for("4657"))
+
+        # new words are tracked too
+        self.index.add_word("go")
+        self.pad.move_letter("g", 4)
+        self.assertEqual(["home", "hood", "good", "gone"], self.index.words_for("4663"))
+        self.assertEqual(["go"], self.index.words_for("46"))
+
+        self.index.detach()
+        self.pad.move_letter("g", 5)
+        self.assertEqual(["go"], self.index.words_for("46"))
+
+    def test_detach_keeps_words_without_a_code(self):
+        self.index.attach()
+        self.pad.remove_key(7)
+        self.index.detach()
+        self.assertEqual(5, len(self.index))
+        self.assertIn("hogs", self.index)
+        self.assertIsNone(self.index.code_of("hogs"))
+
+        # attaching again encodes them if the pad can by now
+        self.pad.add_key(7, "pqrs")
+        self.index.attach()
+        self.assertEqual("4647", self.index.code_of("hogs"))
+        self.assertEqual(["hogs"], self.index.words_for("4647"))
+        self.assertEqual(5, len(self.index))
+
+    def test_adding_a_word_without_a_code_again(self):
+        for attached in (False, True):
+            index = TextonymIndex(self.pad, ["good", "hogs"])
+            index.attach()
+            self.pad.remove_key(7)
+            if not attached:
+                index.detach()
+            self.pad.add_key(7, "pqrs")
+            # a detached index only learns the new code from add_word
+            self.assertEqual("4647", index.add_word("hogs"))
+            self.assertEqual(2, len(index))
+            self.assertEqual(["hogs"], index.words_for("4647"))
+            index.attach()
+            self.assertEqual(2, len(index))
+            self.assertEqual(["hogs"], index.words_for("4647"))
+            index.detach()
+
+
+if __name__ == "__main__":
+    unittest.main()
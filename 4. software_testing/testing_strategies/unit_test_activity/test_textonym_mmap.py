@@ -0,0 +1,71 @@
+import os
+import tempfile
+import unittest
+
+from t9pad import T9Pad
+from textonym_mmap import MappedTextonymIndex, write_index
+
+
+class TestMappedTextonymIndex(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "words.t9ix")
+        self.pad = T9Pad.standard()
+        write_index(
+            self.path,
+            self.pad,
+            ["good", "home", "in", "hood", "go", "hogs", "gone", "bad"],
+        )
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_words_for(self):
+        with MappedTextonymIndex(self.path) as index:
+            self.assertEqual(8, len(index))
+            self.assertEqual(["good", "home", "hood", "gone"], index.words_for("4663"))
+            self.assertEqual(["in", "go"], index.words_for("46"))
+            self.assertEqual(["bad"], index.words_for("223"))
+            self.assertEqual([], index.words_for("466"))
+            self.assertEqual([], index.words_for("99999"))
+            self.assertEqual([], index.words_for(""))
+
+    def test_textonyms_and_groups(self):
+        with MappedTextonymIndex(self.path) as index:
+            self.assertEqual(["home", "hood", "gone"], index.textonyms_of("good"))
+            self.assertEqual(str(self.pad), str(index.pad))
+            self.assertEqual(
+                [("46", ["in", "go"]), ("4663", ["good", "home", "hood", "gone"])],
+                list(index.groups()),
+            )
+
+    def test_rejects_other_files(self):
+        with open(self.path, "wb") as file:
+            file.write(b"not an index at all")
+        with self.assertRaises(ValueError):
+            MappedTextonymIndex(self.path)
+        open(self.path, "wb").close()
+        with self.assertRaises(ValueError):
+            MappedTextonymIndex(self.path)
+
+    def test_rejects_truncated_files(self):
+        with open(self.path, "rb") as file:
+            data = file.read()
+        # cut inside the header, the offset tables and the word blob
+        for size in (10, 40, len(data) - 1):
+            with open(self.path, "wb") as file:
+                file.write(data[:size])
+            with self.assertRaises(ValueError):
+                MappedTextonymIndex(self.path)
+
+    def test_failed_write_leaves_no_temporary_file(self):
+        # the index is written, but can't be renamed onto a directory
+        directory = os.path.join(self.tmp.name, "taken")
+        os.mkdir(directory)
+        with self.assertRaises(OSError):
+            write_index(directory, self.pad, ["good", "home"])
+        self.assertEqual(["taken", "words.t9ix"], sorted(os.listdir(self.tmp.name)))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,60 @@
+import unittest
+
+from t9pad import T9Pad
+from textonym_index import TextonymIndex
+from textonym_parallel import parallel_group_textonyms, parallel_words_to_t9
+
+
+class TestTextonymParallel(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad.standard()
+        self.words = ["good", "home", "in", "hood", "go", "hogs", "gone", "home"]
+
+    def test_parallel_words_to_t9(self):
+        expected = self.pad.words_to_t9(self.words)
+        for workers in (1, 2):
+            codes = parallel_words_to_t9(
+                self.words, self.pad, workers=workers, shard_size=3
+            )
+            self.assertEqual(expected, codes)
+
+    def test_parallel_group_textonyms(self):
+        expected = {"4663": ["good", "home", "hood", "gone"], "46": ["in", "go"]}
+        for workers in (1, 2):
+            groups = parallel_group_textonyms(
+                self.words, self.pad, workers=workers, shard_size=3
+            )
+            self.assertEqual(expected, groups)
+
+    def test_attached_pad_and_wide_letters(self):
+        # the pad's listeners (here an attached index) are not sent to workers
+        index = TextonymIndex(self.pad, self.words)
+        index.attach()
+        self.pad.add_listener(lambda letters: None)
+        self.assertEqual(
+            self.pad.words_to_t9(self.words),
+            parallel_words_to_t9(self.words, self.pad, workers=2, shard_size=3),
+        )
+        wide = T9Pad()
+        wide.add_key(2, "\U0001f600a")
+        self.assertEqual(
+            ["22", "2"],
+            parallel_words_to_t9(["a\U0001f600", "a"], wide, workers=2, shard_size=1),
+        )
+
+    def test_many_shards(self):
+        words = self.words * 100
+        self.assertEqual(
+            self.pad.words_to_t9(words),
+            parallel_words_to_t9(words, self.pad, workers=2, shard_size=7),
+        )
+
+    def test_invalid_word(self):
+        with self.assertRaises(ValueError):
+            parallel_words_to_t9(["good", "g00d"], self.pad, workers=2, shard_size=1)
+        with self.assertRaises(ValueError):
+            parallel_group_textonyms(["good"], self.pad, shard_size=0)
+
+
+if __name__ == "__main__":
+    unittest.main()
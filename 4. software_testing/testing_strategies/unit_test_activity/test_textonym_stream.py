@@ -0,0 +1,53 @@
+import io
+import os
+import tempfile
+import unittest
+
+from t9pad import T9Pad
+from textonym_stream import encode_stream, group_textonyms, read_words
+
+
+class TestTextonymStream(unittest.TestCase):
+    def setUp(self):
+        self.pad = T9Pad.standard()
+        self.words = ["good", "home", "in", "hood", "go", "hogs", "gone", "home"]
+
+    def test_read_words(self):
+        source = io.StringIO("good home\n\n  hood\tgone\n")
+        self.assertEqual(["good", "home", "hood", "gone"], list(read_words(source)))
+
+    def test_encode_stream(self):
+        pairs = list(
+            encode_stream(
+                ["good", "G00d", "in"], self.pad, batch_size=2, skip_invalid=True
+            )
+        )
+        self.assertEqual([("4663", "good"), ("46", "in")], pairs)
+
+        with self.assertRaises(ValueError):
+            list(encode_stream(["good", "G00d"], self.pad))
+
+    def test_group_textonyms_in_memory(self):
+        groups = list(group_textonyms(self.words, self.pad))
+        self.assertEqual(
+            [("46", ["in", "go"]), ("4663", ["good", "home", "hood", "gone"])], groups
+        )
+
+    def test_group_textonyms_spills_to_disk(self):
+        expected = list(group_textonyms(self.words, self.pad, min_size=1))
+        with tempfile.TemporaryDirectory() as spill_dir:
+            groups = group_textonyms(
+                self.words,
+                self.pad,
+                min_size=1,
+                max_words=2,
+                spill_dir=spill_dir,
+                prefix_length=1,
+            )
+            self.assertEqual(expected, list(groups))
+            # partition files are removed once the generator is exhausted
+            self.assertEqual([], os.listdir(spill_dir))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,168 @@
+class TextonymIndex:
+    def __init__(self, pad, words=None):
+        """
+        Constructs an index mapping every T9 sequence to the words that produce it.
+        Each word is converted once with pad.word_to_t9, so lookups afterwards
+        are dictionary lookups instead of repeated is_textonym calls.
+
+        :param pad: The T9Pad used to encode words
+        :param words: Optional iterable of words to add straight away
+        """
+        self._pad = pad
+        # T9 sequence -> list of words, kept in insertion order
+        self._words_by_code = {}
+        # word -> T9 sequence, also used to skip duplicates
+        self._code_of = {}
+        # Only kept while attached to the pad (see attach()): letter -> words
+        # containing it and word -> insertion rank
+        self._words_with_letter = None
+        self._rank = {}
+        # words the pad could not encode after a layout change, in the order
+        # they were dropped (a dict used as an ordered set)
+        self._unmapped = {}
+        if words is not None:
+            self.add_words(words)
+
+    def add_word(self, word):
+        """
+        Adds a single word to the index.
+
+        :param word: The word to add
+        :return: The T9 sequence of the word
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        code = self._code_of.get(word)
+        if code is None:
+            code = self._pad.word_to_t9(word)
+            self._code_of[word] = code
+            self._words_by_code.setdefault(code, []).append(word)
+            if word in self._unmapped:
+                # a word left without a code that encodes again; its letters
+                # are already indexed if attached
+                del self._unmapped[word]
+            elif self._words_with_letter is not None:
+                self._index_letters(word)
+        return code
+
+    def add_words(self, words):
+        """
+        Adds every word of an iterable to the index.
+
+        :param words: Iterable of words
+        :raises ValueError: If a word contains a letter that is not on the pad
+        """
+        for word in words:
+            self.add_word(word)
+
+    def attach(self):
+        """
+        Keeps the index in sync with later changes to the pad's layout.
+        When letters move to another key (or are removed), only the words
+        containing those letters are re-encoded. Words that no longer encode
+        leave the groups until their letters are mapped again.
+
+        Words left without a code from an earlier attachment are encoded
+        again here, in case the pad changed while the index was detached.
+        """
+        if self._words_with_letter is None:
+            self._words_with_letter = {}
+            self._rank = {}
+            for word in self._code_of:
+                self._index_letters(word)
+            for word in self._unmapped:
+                self._index_letters(word)
+            self._pad.add_listener(self._on_pad_changed)
+            if self._unmapped:
+                self._on_pad_changed(set().union(*self._unmapped))
+
+    def detach(self):
+        """
+        Stops following changes to the pad. A detached index keeps the codes
+        it has and does not follow later changes to the pad; words without a
+        code stay in the index and are encoded again by the next attach().
+        """
+        if self._words_with_letter is not None:
+            self._pad.remove_listener(self._on_pad_changed)
+            self._words_with_letter = None
+            self._rank = {}
+
+    def _index_letters(self, word):
+        self._rank[word] = len(self._rank)
+        for letter in set(word):
+            self._words_with_letter.setdefault(letter, set()).add(word)
+
+    def _on_pad_changed(self, letters):
+        affected = set()
+        for letter in letters:
+            affected.update(self._words_with_letter.get(letter, ()))
+        # re-encode in insertion order so groups stay deterministic
+        for word in sorted(affected, key=self._rank.__getitem__):
+            old_code = self._code_of.pop(word, None)
+            if old_code is not None:
+                group = self._words_by_code[old_code]
+                group.remove(word)
+                if not group:
+                    del self._words_by_code[old_code]
+            try:
+                code = self._pad.word_to_t9(word)
+            except ValueError:
+                self._unmapped[word] = None
+                continue
+            self._unmapped.pop(word, None)
+            self._code_of[word] = code
+            self._words_by_code.setdefault(code, []).append(word)
+
+    def __len__(self):
+        """
+        Returns the number of distinct words in the index.
+        """
+        return len(self._code_of) + len(self._unmapped)
+
+    def __contains__(self, word):
+        return word in self._code_of or word in self._unmapped
+
+    def code_of(self, word):
+        """
+        Returns the T9 sequence of an indexed word.
+
+        :param word: The word to look up
+        :return: The T9 string, or None if the word is not in the index
+            or the pad can't encode it any more
+        """
+        return self._code_of.get(word)
+
+    def words_for(self, digits):
+        """
+        Returns the words whose T9 sequence is exactly digits.
+
+        :param digits: The T9 string, e.g. "4663"
+        :return: List of words (empty if none)
+        """
+        return list(self._words_by_code.get(digits, ()))
+
+    def textonyms_of(self, word):
+        """
+        Returns the other words that share the T9 sequence of word.
+        The word itself does not need to be in the index.
+
+        :param word: The word to look up
+        :return: List of textonyms, excluding word itself
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        code = self._code_of.get(word)
+        if code is None:
+            code = self._pad.word_to_t9(word)
+        return [other for other in self._words_by_code.get(code, ()) if other != word]
+
+    def groups(self, min_size=2):
+        """
+        Returns every textonym group with at least min_size words.
+
+        :param min_size: The minimum number of words in a group
+        :return: Dictionary of T9 sequence -> list of words
+        """
+        return {
+            code: list(words)
+            for code, words in self._words_by_code.items()
+            if len(words) >= min_size
+        }
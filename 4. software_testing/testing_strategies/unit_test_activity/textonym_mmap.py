@@ -0,0 +1,225 @@
+import json
+import mmap
+import os
+import struct
+
+from t9pad import T9Pad
+from textonym_index import TextonymIndex
+
+# File layout (all integers are little-endian uint32):
+#   header        magic, version, key count, word count, layout size
+#   layout        JSON object {"2": "abc", ...} describing the pad
+#   key_offsets   key count + 1 offsets into the key blob
+#   group_starts  key count + 1 positions in word_offsets, one group per key
+#   word_offsets  word count + 1 offsets into the word blob
+#   key blob      the sorted T9 sequences, ASCII digits
+#   word blob     the words of every group, UTF-8
+_MAGIC = b"T9IX"
+_VERSION = 1
+_HEADER = struct.Struct("<4sIIII")
+_UINT = struct.Struct("<I")
+
+
+def write_index(path, pad, words):
+    """
+    Builds a textonym index file that MappedTextonymIndex can open.
+    The file is written next to path and renamed into place, so readers
+    never see a half-written index.
+
+    :param path: Where to write the index
+    :param pad: The pad used to encode words; its layout is stored in the file
+    :param words: Iterable of words
+    :raises ValueError: If a word contains a letter that is not on the pad
+    """
+    groups = TextonymIndex(pad, words).groups(min_size=1)
+    keys = sorted(groups)
+    layout = json.dumps(
+        {
+            str(key): "".join(sorted(pad.get_key_letters(key)))
+            for key in sorted(pad.key_set())
+        }
+    ).encode("utf-8")
+
+    key_blob = bytearray()
+    word_blob = bytearray()
+    key_offsets = [0]
+    group_starts = [0]
+    word_offsets = [0]
+    for key in keys:
+        key_blob += key.encode("ascii")
+        key_offsets.append(len(key_blob))
+        for word in groups[key]:
+            word_blob += word.encode("utf-8")
+            word_offsets.append(len(word_blob))
+        group_starts.append(len(word_offsets) - 1)
+
+    tmp_path = f"{path}.tmp"
+    try:
+        with open(tmp_path, "wb") as file:
+            file.write(
+                _HEADER.pack(
+                    _MAGIC, _VERSION, len(keys), len(word_offsets) - 1, len(layout)
+                )
+            )
+            file.write(layout)
+            for offsets in (key_offsets, group_starts, word_offsets):
+                file.write(struct.pack(f"<{len(offsets)}I", *offsets))
+            file.write(key_blob)
+            file.write(word_blob)
+        os.replace(tmp_path, path)
+    except BaseException:
+        # don't leave a half-written file behind
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class MappedTextonymIndex:
+    def __init__(self, path):
+        """
+        Opens an index file written by write_index.
+        The file is memory-mapped and only the header is read, so opening is
+        instant regardless of the size of the index; lookups binary-search
+        the sorted keys directly in the mapped file.
+
+        :param path: The index file
+        :raises ValueError: If the file is not a textonym index or is truncated
+        """
+        with open(path, "rb") as file:
+            try:
+                self._map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            except ValueError:
+                # an empty file can't be mapped
+                raise ValueError(f"{path} is not a textonym index") from None
+        if len(self._map) < _HEADER.size:
+            self._invalid(f"{path} is not a textonym index")
+        magic, version, key_count, word_count, layout_size = _HEADER.unpack_from(
+            self._map
+        )
+        if magic != _MAGIC or version != _VERSION:
+            self._invalid(f"{path} is not a textonym index")
+
+        self._key_count = key_count
+        self._word_count = word_count
+        self._layout_start = _HEADER.size
+        self._layout_end = self._layout_start + layout_size
+        self._key_offsets = self._layout_end
+        self._group_starts = self._key_offsets + (key_count + 1) * _UINT.size
+        self._word_offsets = self._group_starts + (key_count + 1) * _UINT.size
+        self._key_blob = self._word_offsets + (word_count + 1) * _UINT.size
+        # the offset tables must fit before their last entries can be read,
+        # and those give the size the whole file should have
+        if self._key_blob > len(self._map):
+            self._invalid(f"{path} is truncated")
+        self._word_blob = self._key_blob + self._uint(self._key_offsets, key_count)
+        if self._word_blob + self._uint(self._word_offsets, word_count) != len(
+            self._map
+        ):
+            self._invalid(f"{path} is truncated or corrupt")
+        self._pad = None
+
+    def _invalid(self, message):
+        self._map.close()
+        raise ValueError(message)
+
+    def close(self):
+        self._map.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def __len__(self):
+        """
+        Returns the number of words in the index.
+        """
+        return self._word_count
+
+    @property
+    def pad(self):
+        """
+        The T9Pad the index was built with, rebuilt from the file on first use.
+        """
+        if self._pad is None:
+            layout = json.loads(self._map[self._layout_start : self._layout_end])
+            pad = T9Pad()
+            for key, letters in layout.items():
+                pad.add_key(int(key), letters)
+            self._pad = pad
+        return self._pad
+
+    def _uint(self, table, position):
+        return _UINT.unpack_from(self._map, table + position * _UINT.size)[0]
+
+    def _key(self, position):
+        start = self._uint(self._key_offsets, position)
+        end = self._uint(self._key_offsets, position + 1)
+        return self._map[self._key_blob + start : self._key_blob + end]
+
+    def _group(self, position):
+        words = []
+        start = self._uint(self._group_starts, position)
+        end = self._uint(self._group_starts, position + 1)
+        word_start = self._uint(self._word_offsets, start)
+        for word in range(start + 1, end + 1):
+            word_end = self._uint(self._word_offsets, word)
+            words.append(
+                self._map[
+                    self._word_blob + word_start : self._word_blob + word_end
+                ].decode("utf-8")
+            )
+            word_start = word_end
+        return words
+
+    def _find(self, digits):
+        target = digits.encode("ascii", "replace")
+        low, high = 0, self._key_count
+        while low < high:
+            middle = (low + high) // 2
+            if self._key(middle) < target:
+                low = middle + 1
+            else:
+                high = middle
+        if low < self._key_count and self._key(low) == target:
+            return low
+        return None
+
+    def words_for(self, digits):
+        """
+        Returns the words whose T9 sequence is exactly digits.
+
+        :param digits: The T9 string, e.g. "4663"
+        :return: List of words (empty if none)
+        """
+        position = self._find(digits)
+        return [] if position is None else self._group(position)
+
+    def textonyms_of(self, word):
+        """
+        Returns the other words that share the T9 sequence of word.
+
+        :param word: The word to look up
+        :return: List of textonyms, excluding word itself
+        :raises ValueError: If the word contains a letter that is not on the pad
+        """
+        return [
+            other
+            for other in self.words_for(self.pad.word_to_t9(word))
+            if other != word
+        ]
+
+    def groups(self, min_size=2):
+        """
+        Lazily yields every textonym group with at least min_size words.
+
+        :param min_size: The minimum number of words in a group
+        :return: Generator of (T9 sequence, list of words) pairs, sorted by sequence
+        """
+        for position in range(self._key_count):
+            size = self._uint(self._group_starts, position + 1) - self._uint(
+                self._group_starts, position
+            )
+            if size >= min_size:
+                yield self._key(position).decode("ascii"), self._group(position)
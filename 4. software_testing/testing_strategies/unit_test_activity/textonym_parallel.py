@@ -0,0 +1,125 @@
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import islice
+
+from t9pad import FrozenT9Pad, T9Pad
+
+# Shards submitted ahead per worker; bounds how much of the corpus is
+# pickled and held in memory at any time.
+_SHARDS_IN_FLIGHT = 2
+
+# The pad of the current worker process, set once by _init_worker so it is
+# pickled per worker instead of per shard.
+_worker_pad = None
+
+
+def _init_worker(pad):
+    global _worker_pad
+    _worker_pad = pad
+
+
+def _encode_shard(words):
+    return _worker_pad.words_to_t9(words)
+
+
+def _group_shard(words):
+    # T9 sequence -> {word: None}, a set that remembers insertion order
+    groups = {}
+    for code, word in zip(_worker_pad.words_to_t9(words), words):
+        groups.setdefault(code, {})[word] = None
+    return groups
+
+
+def _worker_copy(pad):
+    # A frozen pad pickles as a single bytes table and leaves the pad's
+    # listeners (e.g. an attached TextonymIndex) behind. Pads with letters a
+    # frozen pad can't store get a bare copy instead.
+    if isinstance(pad, FrozenT9Pad):
+        return pad
+    try:
+        return pad.freeze()
+    except ValueError:
+        return T9Pad({key: set(pad.get_key_letters(key)) for key in pad.key_set()})
+
+
+def _shards(words, shard_size):
+    words = iter(words)
+    while True:
+        shard = list(islice(words, shard_size))
+        if not shard:
+            return
+        yield shard
+
+
+def _map_shards(function, words, pad, workers, shard_size):
+    # yields each shard's result, in shard order
+    if shard_size < 1:
+        raise ValueError("shard_size must be at least 1")
+    workers = workers or os.cpu_count() or 1
+    if workers == 1:
+        _init_worker(pad)
+        yield from map(function, _shards(words, shard_size))
+        return
+    executor = ProcessPoolExecutor(
+        max_workers=workers, initializer=_init_worker, initargs=(_worker_copy(pad),)
+    )
+    pending = deque()
+    try:
+        # unlike executor.map, only a few shards are read and sent ahead
+        for shard in _shards(words, shard_size):
+            if len(pending) >= workers * _SHARDS_IN_FLIGHT:
+                yield pending.popleft().result()
+            pending.append(executor.submit(function, shard))
+        while pending:
+            yield pending.popleft().result()
+    finally:
+        executor.shutdown(cancel_futures=True)
+
+
+def parallel_words_to_t9(words, pad, workers=None, shard_size=50000):
+    """
+    Converts words to T9 across a pool of worker processes.
+    Encoding is a single bytes.translate per shard, so sending the words to
+    other processes usually costs more than encoding them; pad.words_to_t9
+    is faster unless each word needs extra work in the workers.
+
+    :param words: Iterable of words
+    :param pad: The pad used to encode words; each worker gets its own copy
+    :param workers: Number of processes (default: one per CPU, 1 runs in-process)
+    :param shard_size: How many words each task converts
+    :return: List of T9 strings, in the same order as words
+    :raises ValueError: If a word contains a letter that is not on the pad
+    """
+    codes = []
+    for shard_codes in _map_shards(_encode_shard, words, pad, workers, shard_size):
+        codes.extend(shard_codes)
+    return codes
+
+
+def parallel_group_textonyms(words, pad, min_size=2, workers=None, shard_size=50000):
+    """
+    Groups words by T9 sequence across a pool of worker processes.
+    Every shard is grouped by a worker and the per-shard maps are merged here.
+
+    :param words: Iterable of words
+    :param pad: The pad used to encode words; each worker gets its own copy
+    :param min_size: The minimum number of distinct words in a group
+    :param workers: Number of processes (default: one per CPU, 1 runs in-process)
+    :param shard_size: How many words each task groups
+    :return: Dictionary of T9 sequence -> list of words, in first-seen order
+    :raises ValueError: If a word contains a letter that is not on the pad
+    """
+    merged = {}
+    for groups in _map_shards(_group_shard, words, pad, workers, shard_size):
+        for code, members in groups.items():
+            current = merged.get(code)
+            if current is None:
+                merged[code] = members
+            else:
+                current.update(members)
+    return {
+        code: list(members)
+        for code, members in merged.items()
+        if len(members) >= min_size
+    }
@@ -0,0 +1,176 @@
+import argparse
+import os
+import sys
+import tempfile
+from itertools import islice
+
+from t9pad import T9Pad
+
+
+def read_words(source):
+    """
+    Lazily yields the whitespace-separated words of a file.
+
+    :param source: A path, "-" for stdin, or an open text file
+    :return: Generator of words
+    """
+    if source == "-":
+        yield from _words_in(sys.stdin)
+    elif hasattr(source, "read"):
+        yield from _words_in(source)
+    else:
+        with open(source, encoding="utf-8") as file:
+            yield from _words_in(file)
+
+
+def _words_in(lines):
+    for line in lines:
+        yield from line.split()
+
+
+def encode_stream(words, pad, batch_size=10000, skip_invalid=False):
+    """
+    Lazily converts words to T9, batch_size words at a time.
+
+    :param words: Iterable of words
+    :param pad: The pad used to encode words
+    :param batch_size: How many words are converted with one words_to_t9 call
+    :param skip_invalid: Drop words with letters that are not on the pad
+        instead of raising
+    :return: Generator of (T9 sequence, word) pairs
+    :raises ValueError: If a word can't be converted and skip_invalid is False
+    """
+    words = iter(words)
+    while True:
+        batch = list(islice(words, batch_size))
+        if not batch:
+            return
+        try:
+            codes = pad.words_to_t9(batch)
+        except ValueError:
+            if not skip_invalid:
+                raise
+            codes = []
+            for word in batch:
+                try:
+                    codes.append(pad.word_to_t9(word))
+                except ValueError:
+                    codes.append(None)
+        for code, word in zip(codes, batch):
+            if code is not None:
+                yield code, word
+
+
+def group_textonyms(
+    words,
+    pad,
+    min_size=2,
+    max_words=None,
+    spill_dir=None,
+    prefix_length=2,
+    skip_invalid=False,
+):
+    """
+    Lazily yields the textonym groups of a stream of words, sorted by T9 sequence.
+
+    Words are grouped in memory until more than max_words distinct words have
+    been seen. After that every pair is written to a partition file named
+    after the first prefix_length digits of its sequence, and the partitions
+    are grouped one at a time, so memory is bounded by the largest partition
+    rather than by the corpus.
+
+    :param words: Iterable of words (each must not contain a newline)
+    :param pad: The pad used to encode words
+    :param min_size: The minimum number of distinct words in a group
+    :param max_words: Distinct words held in memory before spilling; None never spills
+    :param spill_dir: Directory for the temporary partition files (default: system temp)
+    :param prefix_length: Digits of the sequence used to pick a partition
+    :param skip_invalid: Drop words with letters that are not on the pad
+    :return: Generator of (T9 sequence, list of words) pairs
+    """
+    pairs = encode_stream(words, pad, skip_invalid=skip_invalid)
+    # T9 sequence -> {word: None}, a set that remembers insertion order
+    groups = {}
+    seen = 0
+    for code, word in pairs:
+        members = groups.setdefault(code, {})
+        if word not in members:
+            members[word] = None
+            seen += 1
+            if max_words is not None and seen > max_words:
+                yield from _group_spilled(
+                    groups, pairs, min_size, spill_dir, prefix_length
+                )
+                return
+    yield from _sorted_groups(groups, min_size)
+
+
+def _sorted_groups(groups, min_size):
+    for code in sorted(groups):
+        if len(groups[code]) >= min_size:
+            yield code, list(groups[code])
+
+
+def _group_spilled(groups, pairs, min_size, spill_dir, prefix_length):
+    with tempfile.TemporaryDirectory(prefix="textonyms-", dir=spill_dir) as tmp:
+        partitions = {}
+        try:
+            for code, members in groups.items():
+                for word in members:
+                    _spill(partitions, tmp, code[:prefix_length], code, word)
+            groups.clear()
+            for code, word in pairs:
+                _spill(partitions, tmp, code[:prefix_length], code, word)
+        finally:
+            for file in partitions.values():
+                file.close()
+
+        for prefix in sorted(partitions):
+            partition = {}
+            with open(partitions[prefix].name, encoding="utf-8") as file:
+                for line in file:
+                    code, word = line.rstrip("\n").split("\t", 1)
+                    partition.setdefault(code, {})[word] = None
+            yield from _sorted_groups(partition, min_size)
+
+
+def _spill(partitions, directory, prefix, code, word):
+    file = partitions.get(prefix)
+    if file is None:
+        path = os.path.join(directory, f"part-{prefix or 'empty'}.tsv")
+        file = partitions[prefix] = open(path, "w", encoding="utf-8")
+    file.write(f"{code}\t{word}\n")
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(
+        description="Print the textonym groups of a word list using the standard T9 layout."
+    )
+    parser.add_argument(
+        "source", nargs="?", default="-", help='word file, "-" for stdin'
+    )
+    parser.add_argument("--min-size", type=int, default=2)
+    parser.add_argument("--max-words", type=int, default=None)
+    parser.add_argument("--spill-dir", default=None)
+    parser.add_argument("--prefix-length", type=int, default=2)
+    parser.add_argument("--lower", action="store_true", help="lowercase words first")
+    args = parser.parse_args(argv)
+
+    words = read_words(args.source)
+    if args.lower:
+        words = (word.lower() for word in words)
+    groups = group_textonyms(
+        words,
+        T9Pad.standard(),
+        min_size=args.min_size,
+        max_words=args.max_words,
+        spill_dir=args.spill_dir,
+        prefix_length=args.prefix_length,
+        skip_invalid=True,
+    )
+    for code, group in groups:
+        print(f"{code}: {' '.join(group)}")
+
+
+if __name__ == "__main__":
+    main()
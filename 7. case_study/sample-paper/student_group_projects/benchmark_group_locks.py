@@ -0,0 +1,136 @@
+"""
+Multi-threaded stress benchmark for the thread-safe mode of the model.
+
+Worker threads add students to random groups, assign tasks and change task
+statuses. Each thread count gets a fresh object graph; the script reports
+operations per second and checks that both sides of every reference and
+every group's status counters still agree afterwards. It exits with status
+1 when any run left the graph inconsistent.
+
+    python benchmark_group_locks.py --threads 1 2 4 8 16
+    python benchmark_group_locks.py --no-locks
+"""
+
+import argparse
+import random
+import sys
+import threading
+import time
+
+from canva_example_class import (
+    TASK_STATUSES,
+    Group,
+    Student,
+    Supervisor,
+    use_compact_ids,
+    use_thread_safety,
+)
+
+
+def build_graph(group_count, tasks_per_group, student_count):
+    supervisor = Supervisor("Benchmark", "bench@university.edu")
+    groups = [Group(f"Group {number}", "", supervisor) for number in range(group_count)]
+    for group in groups:
+        group.create_tasks((f"Task {number}", "") for number in range(tasks_per_group))
+    students = [
+        Student(f"Student {number}", f"student{number}@university.edu")
+        for number in range(student_count)
+    ]
+    return groups, students
+
+
+def worker(groups, students, operations, seed, barrier):
+    rng = random.Random(seed)
+    barrier.wait()
+    for _ in range(operations):
+        group = rng.choice(groups)
+        action = rng.random()
+        if action < 0.3 or not group.students:
+            group.add_student(rng.choice(students))
+        elif action < 0.7:
+            rng.choice(group.tasks).assign_to_student(rng.choice(group.students))
+        else:
+            rng.choice(group.tasks).update_status(rng.choice(TASK_STATUSES))
+
+
+def check_graph(groups, students):
+    """Return a list of broken invariants (empty when consistent)"""
+    problems = []
+    for group in groups:
+        counts = {status: 0 for status in TASK_STATUSES}
+        for task in group.tasks:
+            counts[task.status] += 1
+            for student in task.assigned_students:
+                if task not in student.assigned_tasks:
+                    problems.append(f"{task!r} missing from {student!r}")
+        if counts != group.status_counts:
+            problems.append(f"{group!r} counts {group.status_counts} != {counts}")
+        if len(group.students) != len(group._student_ids):
+            problems.append(f"{group!r} has duplicate students")
+        for student in group.students:
+            if group not in student.groups:
+                problems.append(f"{group!r} missing from {student!r}")
+            open_tasks = sum(
+                task.group is group and task.status != "Completed"
+                for task in student.assigned_tasks
+            )
+            if group.co_assignments.workload(student) != open_tasks:
+                problems.append(f"{student!r} workload in {group!r} is off")
+    for student in students:
+        if len(student.assigned_tasks) != len(student._task_ids):
+            problems.append(f"{student!r} has duplicate tasks")
+        for task in student.assigned_tasks:
+            if student not in task.assigned_students:
+                problems.append(f"{student!r} missing from {task!r}")
+    return problems
+
+
+def run(thread_count, args):
+    groups, students = build_graph(args.groups, args.tasks, args.students)
+    per_thread = args.operations // thread_count
+    barrier = threading.Barrier(thread_count + 1)
+    threads = [
+        threading.Thread(
+            target=worker, args=(groups, students, per_thread, seed, barrier)
+        )
+        for seed in range(thread_count)
+    ]
+    for thread in threads:
+        thread.start()
+    barrier.wait()
+    start = time.perf_counter()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+    return per_thread * thread_count / elapsed, check_graph(groups, students)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--threads", type=int, nargs="+", default=[1, 2, 4, 8, 16])
+    parser.add_argument("--operations", type=int, default=200_000)
+    parser.add_argument("--groups", type=int, default=500)
+    parser.add_argument("--tasks", type=int, default=20)
+    parser.add_argument("--students", type=int, default=2_000)
+    parser.add_argument("--stripes", type=int, default=64)
+    parser.add_argument(
+        "--no-locks", action="store_true", help="run without thread safety"
+    )
+    args = parser.parse_args(argv)
+
+    use_compact_ids()
+    use_thread_safety(not args.no_locks, args.stripes)
+    print(f"{'threads':>8} {'ops/s':>12}  graph")
+    consistent = True
+    for thread_count in args.threads:
+        throughput, problems = run(thread_count, args)
+        status = "ok" if not problems else f"{len(problems)} problems"
+        print(f"{thread_count:>8} {throughput:>12,.0f}  {status}")
+        for problem in problems[:5]:
+            print(f"{'':>8} {problem}")
+        consistent = consistent and not problems
+    return 0 if consistent else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
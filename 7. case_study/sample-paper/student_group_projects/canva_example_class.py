@@ -1,110 +1,731 @@
-from typing import List, Set
-from datetime import datetime
+from typing import (
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    NamedTuple,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
+import logging
+import weakref
+from bisect import bisect_left, insort
+from contextlib import nullcontext
+from datetime import date, datetime, timezone
+from itertools import count
+from threading import Lock, RLock, local
 from uuid import uuid4
 
+TASK_STATUSES = ("Pending", "In Progress", "Completed")
+# every task shares these three string objects instead of keeping its own copy
+_CANONICAL_STATUS = {status: status for status in TASK_STATUSES}
+
+EntityId = Union[int, str]
+
+
+class IdAllocator:
+    """
+    Hands out entity ids: uuid4 strings by default, dense ints in compact mode.
+
+    A compact id's uuid is kept only while the object that needed it (the
+    first to ask for its external id, or the one built from restore()) is
+    alive, and is released when that object is garbage collected.
+    """
+
+    __slots__ = ("compact", "_ids", "_external_ids", "_restored")
+
+    def __init__(self, compact: bool = False):
+        self.compact = compact
+        # next() on a count is atomic, so threads never get the same id
+        self._ids = count()
+        # compact id -> uuid, only for ids whose external id was requested
+        self._external_ids: Dict[int, str] = {}
+        # ids from restore() whose object has not been built yet
+        self._restored: Set[int] = set()
+
+    def __len__(self):
+        """Number of compact ids currently holding a uuid"""
+        return len(self._external_ids)
+
+    def allocate(self) -> EntityId:
+        """Return a new id"""
+        if not self.compact:
+            return str(uuid4())
+        return next(self._ids)
+
+    def claim(self, entity, entity_id: Optional[EntityId] = None) -> EntityId:
+        """Return the id of a new entity: entity_id if given, else a new one"""
+        if entity_id is None:
+            return self.allocate()
+        if entity_id in self._restored:
+            self._restored.discard(entity_id)
+            self._release_with(entity, entity_id)
+        return entity_id
+
+    def restore(self, external_id: str) -> EntityId:
+        """Return an id for an object loaded back under a known uuid"""
+        if not self.compact:
+            return external_id
+        entity_id = self.allocate()
+        self._external_ids[entity_id] = external_id
+        self._restored.add(entity_id)
+        return entity_id
+
+    def external_id(self, entity) -> str:
+        """Return a stable uuid string for an entity, created on first request"""
+        entity_id = entity.id
+        if isinstance(entity_id, str):
+            return entity_id
+        external_id = self._external_ids.get(entity_id)
+        if external_id is None:
+            # setdefault, so two threads asking at once agree on one uuid
+            new_id = str(uuid4())
+            external_id = self._external_ids.setdefault(entity_id, new_id)
+            if external_id is new_id:
+                self._release_with(entity, entity_id)
+        return external_id
+
+    def _release_with(self, entity, entity_id: int):
+        weakref.finalize(entity, self._external_ids.pop, entity_id, None)
+
+
+_id_allocator = IdAllocator()
+
+
+def use_compact_ids(compact: bool = True):
+    """
+    Switch the id mode for entities created from now on. The compact counter
+    is never reset, so new ids can't clash with those already handed out.
+    """
+    _id_allocator.compact = compact
+
+
+def restore_id(external_id: str) -> EntityId:
+    """
+    Id to pass as entity_id when rebuilding an object saved under external_id.
+    In compact mode the uuid is kept until that object is garbage collected,
+    so build the object with it.
+    """
+    return _id_allocator.restore(external_id)
+
+
+def _deadline_key(deadline: Union[date, datetime]) -> datetime:
+    """
+    A deadline as a naive UTC datetime, so date and datetime deadlines sort
+    together: dates count from midnight, aware datetimes are converted to
+    UTC and naive datetimes are taken to be in UTC already.
+    """
+    if isinstance(deadline, datetime):
+        if deadline.tzinfo is not None:
+            deadline = deadline.astimezone(timezone.utc).replace(tzinfo=None)
+        return deadline
+    if isinstance(deadline, date):
+        return datetime(deadline.year, deadline.month, deadline.day)
+    raise TypeError(
+        f"Deadline must be a date or datetime, not {type(deadline).__name__}"
+    )
+
+
+class DeadlineIndex:
+    """
+    Unfinished tasks that have a deadline, kept sorted by deadline.
+
+    Queries are binary searches. Adding or removing one task is a binary
+    search plus a list insert or delete, which moves the entries after it:
+    O(n), but a fast memmove for the sizes a group or a course reaches.
+    Deadlines and the now, start and end arguments are compared as naive
+    UTC datetimes (see _deadline_key).
+    """
+
+    __slots__ = ("_entries", "_keys", "_sequence")
+
+    def __init__(self):
+        # (deadline, sequence, task); the sequence breaks ties between equal
+        # deadlines so tasks themselves are never compared
+        self._entries: List[Tuple[datetime, int, Task]] = []
+        # keyed by id(task), not task.id: two loaded copies of the same task
+        # are separate entries. An indexed task stays alive, so its id() is
+        # never reused while it is here.
+        self._keys: Dict[int, Tuple[datetime, int]] = {}
+        self._sequence = count()
+
+    def __len__(self):
+        return len(self._entries)
+
+    def __contains__(self, task):
+        return id(task) in self._keys
+
+    def add(self, task):
+        """Index a task by its deadline"""
+        if id(task) not in self._keys:
+            key = (_deadline_key(task.deadline), next(self._sequence))
+            self._keys[id(task)] = key
+            insort(self._entries, (*key, task))
+
+    def add_many(self, tasks: Iterable["Task"]):
+        """Index many tasks with a single sort"""
+        for task in tasks:
+            if id(task) not in self._keys:
+                key = (_deadline_key(task.deadline), next(self._sequence))
+                self._keys[id(task)] = key
+                self._entries.append((*key, task))
+        self._entries.sort(key=lambda entry: entry[:2])
+
+    def clear(self):
+        """Stop indexing every task"""
+        self._entries.clear()
+        self._keys.clear()
+
+    def discard(self, task):
+        """Stop indexing a task"""
+        key = self._keys.pop(id(task), None)
+        if key is not None:
+            del self._entries[bisect_left(self._entries, key)]
+
+    def next_due(self, n: int, now: Optional[datetime] = None):
+        """The n tasks due soonest, only those due at or after now if given"""
+        start = 0 if now is None else bisect_left(self._entries, (_deadline_key(now),))
+        return [entry[2] for entry in self._entries[start : start + n]]
+
+    def overdue(self, now: Optional[datetime] = None):
+        """Tasks whose deadline is before now (default: the current UTC time)"""
+        now = _deadline_key(now or datetime.now(timezone.utc))
+        end = bisect_left(self._entries, (now,))
+        return [entry[2] for entry in self._entries[:end]]
+
+    def due_between(self, start: datetime, end: datetime):
+        """Tasks with a deadline in [start, end), earliest first"""
+        first = bisect_left(self._entries, (_deadline_key(start),))
+        last = bisect_left(self._entries, (_deadline_key(end),))
+        return [entry[2] for entry in self._entries[first:last]]
+
+
+class CoAssignmentIndex:
+    """
+    The student-task assignments of one group, kept as adjacency counts.
+
+    For every student it holds how many tasks they share with each other
+    student and how many of their tasks are not completed yet. Students that
+    share a task, directly or through others, are merged into one team with
+    a union-find forest.
+    """
+
+    __slots__ = ("_partners", "_open_tasks", "_parent")
+
+    def __init__(self):
+        # student id -> partner id -> number of tasks they share
+        self._partners: Dict[EntityId, Dict[EntityId, int]] = {}
+        # student id -> number of assigned tasks not completed
+        self._open_tasks: Dict[EntityId, int] = {}
+        # student id -> parent in the union-find forest
+        self._parent: Dict[EntityId, EntityId] = {}
+
+    def add(self, task, student):
+        """Record student as the newest entry of task.assigned_students"""
+        partners = self._partners.setdefault(student.id, {})
+        self._parent.setdefault(student.id, student.id)
+        for other in task.assigned_students:
+            if other is student:
+                continue
+            partners[other.id] = partners.get(other.id, 0) + 1
+            other_partners = self._partners[other.id]
+            other_partners[student.id] = other_partners.get(student.id, 0) + 1
+            self._union(student.id, other.id)
+        if task.status != "Completed":
+            self._open_tasks[student.id] = self._open_tasks.get(student.id, 0) + 1
+
+    def reopen(self, task, is_open: bool):
+        """Record task moving into (False) or out of (True) Completed"""
+        change = 1 if is_open else -1
+        for student in task.assigned_students:
+            self._open_tasks[student.id] = self._open_tasks.get(student.id, 0) + change
+
+    def partners(self, student) -> Dict[EntityId, int]:
+        """Ids of the students sharing tasks with student, with how many"""
+        return dict(self._partners.get(student.id, {}))
+
+    def workload(self, student) -> int:
+        """Number of the student's tasks in this group that are not completed"""
+        return self._open_tasks.get(student.id, 0)
+
+    def workloads(self) -> Dict[EntityId, int]:
+        """Open task count of every student that has been assigned a task"""
+        return dict(self._open_tasks)
+
+    def teams(self, students: Iterable["Student"]) -> List[List["Student"]]:
+        """Split students into teams connected by shared tasks"""
+        teams: Dict[EntityId, List[Student]] = {}
+        for student in students:
+            root = self._find(student.id) if student.id in self._parent else student.id
+            teams.setdefault(root, []).append(student)
+        return list(teams.values())
+
+    def _find(self, student_id: EntityId) -> EntityId:
+        parent = self._parent
+        root = student_id
+        while parent[root] != root:
+            root = parent[root]
+        while parent[student_id] != root:
+            parent[student_id], student_id = root, parent[student_id]
+        return root
+
+    def _union(self, first: EntityId, second: EntityId):
+        first, second = self._find(first), self._find(second)
+        if first != second:
+            self._parent[second] = first
+
+
+# every unfinished task with a deadline, across all groups, while
+# use_global_deadlines() is on
+global_deadlines = DeadlineIndex()
+# guards global_deadlines, which tasks of every group share
+_global_deadlines_lock = Lock()
+_global_deadlines_enabled = False
+
+
+def use_global_deadlines(enabled: bool = True):
+    """
+    Switch the course-wide global_deadlines index on or off. While on, it
+    indexes the tasks given a deadline from then on and keeps them alive
+    until they are completed; switching it off empties it.
+    """
+    global _global_deadlines_enabled
+    with _global_deadlines_lock:
+        _global_deadlines_enabled = enabled
+        if not enabled:
+            global_deadlines.clear()
+
+
+class LockStripes:
+    """
+    A fixed set of re-entrant locks; every entity id maps to one of them.
+
+    Operations lock the stripes of every object they change, always in
+    stripe order, so two threads can't deadlock and changes to unrelated
+    groups rarely wait on each other.
+    """
+
+    __slots__ = ("_locks",)
+
+    def __init__(self, size: int = 64):
+        self._locks = [RLock() for _ in range(size)]
+
+    def hold(self, *entities):
+        """Context manager holding the stripes of all the entities"""
+        size = len(self._locks)
+        stripes = sorted({hash(entity.id) % size for entity in entities})
+        return _HeldLocks([self._locks[stripe] for stripe in stripes])
+
+
+class _HeldLocks:
+    __slots__ = ("_locks",)
+
+    def __init__(self, locks: List[RLock]):
+        self._locks = locks
+
+    def __enter__(self):
+        for lock in self._locks:
+            lock.acquire()
+
+    def __exit__(self, *exc_info):
+        for lock in reversed(self._locks):
+            lock.release()
+
+
+_lock_stripes: Optional[LockStripes] = None
+_NOT_LOCKED = nullcontext()
+
+
+def use_thread_safety(enabled: bool = True, stripes: int = 64):
+    """
+    Switch locking of groups, students and tasks on or off.
+    Call it before any thread starts changing the object graph.
+    """
+    global _lock_stripes
+    _lock_stripes = LockStripes(stripes) if enabled else None
+
+
+def _locked(*entities):
+    """Hold the stripes of the entities when thread safety is on"""
+    if _lock_stripes is None:
+        return _NOT_LOCKED
+    return _lock_stripes.hold(*entities)
+
+
+class StatusChange(NamedTuple):
+    """A task moving from old_status to new_status"""
+
+    task: "Task"
+    old_status: str
+    new_status: str
+
+
+# called with a StatusChange after every task status change
+_status_observers: List[Callable[[StatusChange], None]] = []
+
+
+def add_status_observer(observer: Callable[[StatusChange], None]):
+    """Call observer after every task status change"""
+    if observer not in _status_observers:
+        _status_observers.append(observer)
+
+
+def remove_status_observer(observer: Callable[[StatusChange], None]):
+    if observer in _status_observers:
+        _status_observers.remove(observer)
+
+
+def _notify(change: StatusChange):
+    # a failing observer is logged and must not undo or block the change
+    for observer in list(_status_observers):
+        try:
+            observer(change)
+        except Exception:
+            logging.getLogger(__name__).exception("Status observer %r failed", observer)
+
+
+# per thread: changes made inside an outer operation, see _deferred_changes
+_pending = local()
+
+
+class _DeferredChanges:
+    """
+    Holds back status changes made inside an operation until it is over.
+
+    Operations that hold lock stripes wrap themselves in this, so observers
+    run after every stripe is released: an observer changing another group
+    can then never take stripes out of order.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        depth = getattr(_pending, "depth", 0)
+        if depth == 0:
+            _pending.changes = []
+        _pending.depth = depth + 1
+
+    def __exit__(self, *exc_info):
+        _pending.depth -= 1
+        if _pending.depth == 0:
+            changes, _pending.changes = _pending.changes, []
+            for change in changes:
+                _notify(change)
+
+
+_deferred_changes = _DeferredChanges()
+
+
+def _publish(change: StatusChange):
+    if getattr(_pending, "depth", 0):
+        _pending.changes.append(change)
+    else:
+        _notify(change)
+
 
 class Supervisor:
-    def __init__(self, name: str, email: str):
-        self.id = str(uuid4())
+    __slots__ = ("id", "name", "email", "groups", "_group_ids", "__weakref__")
+
+    def __init__(self, name: str, email: str, entity_id: Optional[EntityId] = None):
+        self.id = _id_allocator.claim(self, entity_id)
         self.name = name
         self.email = email
         self.groups: List[Group] = []
+        # ids of self.groups, for O(1) membership checks
+        self._group_ids: Set[EntityId] = set()
 
     def monitor_group(self, group):
         """Monitor activities of a specific group"""
-        if group in self.groups:
+        if group.id in self._group_ids:
             print(f"Monitoring group: {group.name}")
             return True
         return False
 
     def review_progress(self, group):
         """Review progress of a specific group"""
-        if group in self.groups:
+        if group.id in self._group_ids:
             task_count = len(group.tasks)
-            completed_tasks = sum(
-                1 for task in group.tasks if task.status == "Completed"
-            )
-            completion_rate = completed_tasks / task_count if task_count > 0 else 0
+            completed_tasks = group.status_counts["Completed"]
+            completion_rate = group.completion_rate()
             print(
                 f"Group {group.name} progress: {completion_rate:.0%} ({completed_tasks}/{task_count} tasks completed)"
             )
             return completion_rate
         return None
 
+    def review_all_progress(self):
+        """Completion rate of every group, keyed by group id"""
+        return {group.id: group.completion_rate() for group in self.groups}
+
+    @property
+    def external_id(self) -> str:
+        """uuid string identifying this object outside the process"""
+        return _id_allocator.external_id(self)
+
     def __repr__(self):
         return f"Supervisor(id={self.id}, name={self.name}, email={self.email})"
 
 
 class Student:
-    def __init__(self, name: str, email: str):
-        self.id = str(uuid4())
+    __slots__ = (
+        "id",
+        "name",
+        "email",
+        "groups",
+        "assigned_tasks",
+        "_group_ids",
+        "_task_ids",
+        "__weakref__",
+    )
+
+    def __init__(self, name: str, email: str, entity_id: Optional[EntityId] = None):
+        self.id = _id_allocator.claim(self, entity_id)
         self.name = name
         self.email = email
         self.groups: List[Group] = []
         self.assigned_tasks: List[Task] = []
+        # ids of self.groups and self.assigned_tasks, for O(1) membership checks
+        self._group_ids: Set[EntityId] = set()
+        self._task_ids: Set[EntityId] = set()
 
     def join_group(self, group):
         """Join a project group"""
-        if group not in self.groups:
-            self.groups.append(group)
-            group.add_student(self)
-            return True
-        return False
+        with _locked(group, self):
+            if group.id not in self._group_ids:
+                self.groups.append(group)
+                self._group_ids.add(group.id)
+                group.add_student(self)
+                return True
+            return False
 
     def complete_task(self, task):
         """Mark a task as completed"""
-        if task in self.assigned_tasks:
+        if task.id in self._task_ids:
             task.update_status("Completed")
             return True
         return False
 
+    @property
+    def external_id(self) -> str:
+        """uuid string identifying this object outside the process"""
+        return _id_allocator.external_id(self)
+
     def __repr__(self):
         return f"Student(id={self.id}, name={self.name}, email={self.email})"
 
 
 class Group:
-    def __init__(self, name: str, description: str, supervisor: Supervisor):
-        self.id = str(uuid4())
+    __slots__ = (
+        "id",
+        "name",
+        "description",
+        "creation_date",
+        "supervisor",
+        "students",
+        "tasks",
+        "_student_ids",
+        "_task_ids",
+        "status_counts",
+        "deadlines",
+        "co_assignments",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        supervisor: Supervisor,
+        entity_id: Optional[EntityId] = None,
+    ):
+        self.id = _id_allocator.claim(self, entity_id)
         self.name = name
         self.description = description
         self.creation_date = datetime.now()
         self.supervisor = supervisor
         self.students: List[Student] = []
         self.tasks: List[Task] = []
+        # ids of self.students and self.tasks, for O(1) membership checks
+        self._student_ids: Set[EntityId] = set()
+        self._task_ids: Set[EntityId] = set()
+        # number of self.tasks in each status, kept up to date by Task
+        self.status_counts: Dict[str, int] = {status: 0 for status in TASK_STATUSES}
+        # this group's unfinished tasks with a deadline, see DeadlineIndex
+        self.deadlines = DeadlineIndex()
+        # who shares tasks with whom, see CoAssignmentIndex
+        self.co_assignments = CoAssignmentIndex()
 
         # Add this group to supervisor's groups
-        supervisor.groups.append(self)
+        with _locked(supervisor):
+            supervisor.groups.append(self)
+            supervisor._group_ids.add(self.id)
 
     def add_student(self, student: Student):
         """Add a student to the group"""
-        if student not in self.students:
-            self.students.append(student)
-            if self not in student.groups:
-                student.groups.append(self)
-            return True
-        return False
+        with _locked(self, student):
+            if student.id not in self._student_ids:
+                self.students.append(student)
+                self._student_ids.add(student.id)
+                if self.id not in student._group_ids:
+                    student.groups.append(self)
+                    student._group_ids.add(self.id)
+                return True
+            return False
 
     def create_task(self, title: str, description: str, deadline=None):
         """Create a new task for this group"""
-        task = Task(title, description, self, deadline)
-        self.tasks.append(task)
+        return self.add_task(Task(title, description, self, deadline))
+
+    def add_task(self, task):
+        """Add a task that was built for this group, e.g. one loaded from storage"""
+        if task.group is not self:
+            raise ValueError("Task belongs to another group")
+        if task.deadline is not None:
+            _deadline_key(task.deadline)
+        with _locked(self):
+            if task.id not in self._task_ids:
+                self.tasks.append(task)
+                self._task_ids.add(task.id)
+                self.status_counts[task.status] += 1
+                if task.deadline is not None and task.status != "Completed":
+                    self.deadlines.add(task)
+                    if _global_deadlines_enabled:
+                        with _global_deadlines_lock:
+                            global_deadlines.add(task)
         return task
 
+    def restore_task(self, task, status: str, students: Iterable[Student] = ()):
+        """
+        Add a task loaded from storage in its saved status, assigned to the
+        given members, without going through the mutators: no status events
+        are published and the deadline indexes see the task only once.
+        """
+        if status not in TASK_STATUSES:
+            raise ValueError(f"Unknown task status {status!r}")
+        students = list(students)
+        with _locked(self, *students):
+            task.status = _CANONICAL_STATUS[status]
+            for student in students:
+                if student.id in self._student_ids:
+                    task._link(student)
+            return self.add_task(task)
+
     def assign_task(self, task, students: List[Student]):
         """Assign a task to student(s)"""
-        if task in self.tasks and all(student in self.students for student in students):
+        with _deferred_changes, _locked(self, *students):
+            if task.id in self._task_ids and all(
+                student.id in self._student_ids for student in students
+            ):
+                for student in students:
+                    task.assign_to_student(student)
+                return True
+            return False
+
+    def enroll_students(self, students: Iterable[Student]):
+        """Add many students to the group, return how many were new"""
+        students = list(students)
+        added = 0
+        with _locked(self, *students):
             for student in students:
-                task.assign_to_student(student)
+                if student.id in self._student_ids:
+                    continue
+                self.students.append(student)
+                self._student_ids.add(student.id)
+                if self.id not in student._group_ids:
+                    student.groups.append(self)
+                    student._group_ids.add(self.id)
+                added += 1
+        return added
+
+    def create_tasks(self, rows: Iterable[tuple]):
+        """Create many tasks from (title, description[, deadline]) rows"""
+        rows = list(rows)
+        for row in rows:
+            if len(row) not in (2, 3):
+                raise ValueError(f"Task row must have 2 or 3 fields: {row!r}")
+        tasks = [
+            Task(title, description, self, *deadline)
+            for title, description, *deadline in rows
+        ]
+        with_deadline = [task for task in tasks if task.deadline is not None]
+        with _locked(self):
+            self.tasks.extend(tasks)
+            self._task_ids.update(task.id for task in tasks)
+            self.status_counts["Pending"] += len(tasks)
+            if with_deadline:
+                self.deadlines.add_many(with_deadline)
+                if _global_deadlines_enabled:
+                    with _global_deadlines_lock:
+                        global_deadlines.add_many(with_deadline)
+        return tasks
+
+    def assign_tasks(self, assignments: Dict["Task", Iterable[Student]]):
+        """Assign many tasks at once; nothing is assigned unless all are valid"""
+        assignments = {task: list(students) for task, students in assignments.items()}
+        with _deferred_changes, _locked(
+            self,
+            *(student for students in assignments.values() for student in students),
+        ):
+            for task, students in assignments.items():
+                if task.id not in self._task_ids or not all(
+                    student.id in self._student_ids for student in students
+                ):
+                    return False
+
+            for task, students in assignments.items():
+                assigned = False
+                for student in students:
+                    if task._link(student):
+                        assigned = True
+                if assigned:
+                    task._set_status("In Progress")
             return True
-        return False
+
+    def teams(self):
+        """The group's students, split into teams connected by shared tasks"""
+        return self.co_assignments.teams(self.students)
+
+    def completion_rate(self):
+        """Share of this group's tasks that are completed"""
+        task_count = len(self.tasks)
+        return self.status_counts["Completed"] / task_count if task_count > 0 else 0
+
+    @property
+    def external_id(self) -> str:
+        """uuid string identifying this object outside the process"""
+        return _id_allocator.external_id(self)
 
     def __repr__(self):
         return f"Group(id={self.id}, name={self.name}, students={len(self.students)})"
 
 
 class Task:
-    def __init__(self, title: str, description: str, group: Group, deadline=None):
-        self.id = str(uuid4())
+    __slots__ = (
+        "id",
+        "title",
+        "description",
+        "group",
+        "deadline",
+        "creation_date",
+        "status",
+        "assigned_students",
+        "__weakref__",
+    )
+
+    def __init__(
+        self,
+        title: str,
+        description: str,
+        group: Group,
+        deadline=None,
+        entity_id: Optional[EntityId] = None,
+    ):
+        if deadline is not None:
+            # fails here, before any group or index sees the task
+            _deadline_key(deadline)
+        self.id = _id_allocator.claim(self, entity_id)
         self.title = title
         self.description = description
         self.group = group
@@ -115,22 +736,81 @@ class Task:
 
     def assign_to_student(self, student: Student):
         """Assign the task to a student"""
-        if student in self.group.students and student not in self.assigned_students:
-            self.assigned_students.append(student)
-            if self not in student.assigned_tasks:
-                student.assigned_tasks.append(self)
-            self.status = "In Progress"
-            return True
-        return False
+        with _deferred_changes, _locked(self.group, student):
+            if student.id in self.group._student_ids and self._link(student):
+                self._set_status("In Progress")
+                return True
+            return False
+
+    def _link(self, student: Student):
+        """Record both sides of an assignment; False if it already exists"""
+        # Both sides are always updated together, so the student's task ids
+        # also tell whether the student is in self.assigned_students; a
+        # second set per task would cost more memory than the task itself.
+        if self.id in student._task_ids:
+            return False
+        self.assigned_students.append(student)
+        student.assigned_tasks.append(self)
+        student._task_ids.add(self.id)
+        self.group.co_assignments.add(self, student)
+        return True
 
     def update_status(self, status: str):
         """Update the status of the task"""
-        valid_statuses = ["Pending", "In Progress", "Completed"]
-        if status in valid_statuses:
-            self.status = status
+        if status in TASK_STATUSES:
+            self._set_status(status)
             return True
         return False
 
+    def _set_status(self, status: str):
+        """Change the status and the group's status counters together"""
+        with _locked(self.group):
+            old_status = self.status
+            if status == old_status:
+                return
+            self.status = _CANONICAL_STATUS[status]
+            if "Completed" in (status, old_status):
+                self.group.co_assignments.reopen(self, status != "Completed")
+            if self.id in self.group._task_ids:
+                self.group.status_counts[old_status] -= 1
+                self.group.status_counts[status] += 1
+                if self.deadline is not None and "Completed" in (status, old_status):
+                    self._track_deadline(status != "Completed")
+        if _status_observers:
+            _publish(StatusChange(self, old_status, _CANONICAL_STATUS[status]))
+
+    def set_deadline(self, deadline):
+        """Change the deadline and keep the deadline indexes in sync"""
+        if deadline is not None:
+            _deadline_key(deadline)
+        with _locked(self.group):
+            self._track_deadline(False)
+            self.deadline = deadline
+            if (
+                deadline is not None
+                and self.status != "Completed"
+                and self.id in self.group._task_ids
+            ):
+                self._track_deadline(True)
+
+    def _track_deadline(self, tracked: bool):
+        # the caller holds the group's stripe
+        if tracked:
+            self.group.deadlines.add(self)
+            if _global_deadlines_enabled:
+                with _global_deadlines_lock:
+                    global_deadlines.add(self)
+        else:
+            self.group.deadlines.discard(self)
+            if _global_deadlines_enabled:
+                with _global_deadlines_lock:
+                    global_deadlines.discard(self)
+
+    @property
+    def external_id(self) -> str:
+        """uuid string identifying this object outside the process"""
+        return _id_allocator.external_id(self)
+
     def __repr__(self):
         return f"Task(id={self.id}, title={self.title}, status={self.status})"
 
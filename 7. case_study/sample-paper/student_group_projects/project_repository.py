@@ -0,0 +1,367 @@
+import sqlite3
+import threading
+from contextlib import contextmanager
+from datetime import date, datetime
+from queue import Queue
+from typing import Dict, List, Optional, Tuple
+
+from canva_example_class import Group, Student, Supervisor, Task, restore_id
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS supervisors (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS students (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, email TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS groups (
+    id TEXT PRIMARY KEY, name TEXT NOT NULL, description TEXT NOT NULL,
+    creation_date TEXT NOT NULL, supervisor_id TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS group_students (
+    group_id TEXT NOT NULL, student_id TEXT NOT NULL, seq INTEGER NOT NULL,
+    PRIMARY KEY (group_id, student_id)
+);
+CREATE TABLE IF NOT EXISTS tasks (
+    id TEXT PRIMARY KEY, group_id TEXT NOT NULL, title TEXT NOT NULL,
+    description TEXT NOT NULL, deadline TEXT, creation_date TEXT NOT NULL,
+    status TEXT NOT NULL, seq INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS tasks_by_group ON tasks (group_id, seq);
+CREATE TABLE IF NOT EXISTS assignments (
+    task_id TEXT NOT NULL, student_id TEXT NOT NULL, seq INTEGER NOT NULL,
+    PRIMARY KEY (task_id, student_id)
+);
+"""
+
+_WRITES = {
+    "supervisor": "INSERT OR REPLACE INTO supervisors VALUES (?, ?, ?)",
+    "student": "INSERT OR REPLACE INTO students VALUES (?, ?, ?)",
+    "group": "INSERT OR REPLACE INTO groups VALUES (?, ?, ?, ?, ?)",
+    "membership": "INSERT OR IGNORE INTO group_students VALUES (?, ?, ?)",
+    "task": "INSERT OR REPLACE INTO tasks VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+    "assignment": "INSERT OR IGNORE INTO assignments VALUES (?, ?, ?)",
+    "status": "UPDATE tasks SET status = ? WHERE id = ?",
+}
+
+
+def _to_text(value):
+    # datetime is a subclass of date; both keep their type through isoformat
+    return value.isoformat() if isinstance(value, date) else value
+
+
+def _from_text(value):
+    if value is None:
+        return None
+    try:
+        if "T" in value:
+            return datetime.fromisoformat(value)
+        return date.fromisoformat(value)
+    except ValueError:
+        return value
+
+
+class ConnectionPool:
+    """A fixed number of SQLite connections shared between threads"""
+
+    def __init__(self, path: str, size: int = 4):
+        self._connections: Queue = Queue()
+        for _ in range(size):
+            connection = sqlite3.connect(path, check_same_thread=False)
+            connection.execute("PRAGMA journal_mode=WAL")
+            connection.execute("PRAGMA synchronous=NORMAL")
+            self._connections.put(connection)
+        self._size = size
+
+    @contextmanager
+    def connection(self):
+        """Borrow a connection; blocks while all of them are in use"""
+        connection = self._connections.get()
+        try:
+            yield connection
+        finally:
+            self._connections.put(connection)
+
+    def close(self):
+        for _ in range(self._size):
+            self._connections.get().close()
+
+
+class ProjectRepository:
+    """
+    Stores the Supervisor/Group/Student/Task graph in a SQLite file.
+
+    Writes are buffered and flushed in one transaction once batch_size of
+    them are pending (or on flush/close). A batch whose transaction fails is
+    rolled back and discarded, and the error is raised from that flush.
+    Groups are loaded lazily by id, each with its supervisor, students and
+    tasks; objects already loaded are returned again instead of being
+    rebuilt. Rows are keyed by external_id, so the file works with both uuid
+    and compact ids. Queries run on pooled connections outside the lock, so
+    threads can read concurrently.
+    """
+
+    def __init__(self, path: str, pool_size: int = 4, batch_size: int = 1000):
+        self._pool = ConnectionPool(path, pool_size)
+        with self._pool.connection() as connection:
+            connection.executescript(SCHEMA)
+        self._batch_size = batch_size
+        # runs of consecutive writes of the same kind, in the order they were
+        # made; each run becomes one executemany call
+        self._pending: List[Tuple[str, List[Tuple]]] = []
+        self._pending_count = 0
+        # guards the pending writes and the identity maps; never held for I/O
+        self._lock = threading.RLock()
+        # keeps flushes in order, so a later batch never commits first
+        self._flush_lock = threading.Lock()
+        # external id -> loaded object
+        self._supervisors: Dict[str, Supervisor] = {}
+        self._students: Dict[str, Student] = {}
+        self._groups: Dict[str, Group] = {}
+        self._tasks: Dict[str, Task] = {}
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def close(self):
+        """Flush pending writes and close every connection"""
+        try:
+            self.flush()
+        finally:
+            self._pool.close()
+
+    # --- writes -----------------------------------------------------------
+
+    def _write(self, kind: str, row: Tuple):
+        with self._lock:
+            if self._pending and self._pending[-1][0] == kind:
+                self._pending[-1][1].append(row)
+            else:
+                self._pending.append((kind, [row]))
+            self._pending_count += 1
+            full = self._pending_count >= self._batch_size
+        if full:
+            self.flush()
+
+    def flush(self):
+        """Write every pending change in a single transaction"""
+        with self._flush_lock:
+            with self._lock:
+                # taken out before writing, so a failed batch is not retried
+                # by every later write
+                pending, self._pending = self._pending, []
+                self._pending_count = 0
+            if pending:
+                with self._pool.connection() as connection:
+                    with connection:
+                        for kind, rows in pending:
+                            connection.executemany(_WRITES[kind], rows)
+
+    def save_supervisor(self, supervisor: Supervisor):
+        self._supervisors[supervisor.external_id] = supervisor
+        self._write(
+            "supervisor", (supervisor.external_id, supervisor.name, supervisor.email)
+        )
+
+    def save_student(self, student: Student):
+        self._students[student.external_id] = student
+        self._write("student", (student.external_id, student.name, student.email))
+
+    def save_group(self, group: Group):
+        self._groups[group.external_id] = group
+        self._write(
+            "group",
+            (
+                group.external_id,
+                group.name,
+                group.description,
+                _to_text(group.creation_date),
+                group.supervisor.external_id,
+            ),
+        )
+
+    def save_task(self, task: Task, position: Optional[int] = None):
+        """Queue a task; position defaults to the last place in its group"""
+        if position is None:
+            position = len(task.group.tasks) - 1
+        self._tasks[task.external_id] = task
+        self._write(
+            "task",
+            (
+                task.external_id,
+                task.group.external_id,
+                task.title,
+                task.description,
+                _to_text(task.deadline),
+                _to_text(task.creation_date),
+                task.status,
+                position,
+            ),
+        )
+
+    def record_membership(self, group: Group, student: Student):
+        """Queue a student having joined a group (call after add_student)"""
+        self._write(
+            "membership",
+            (group.external_id, student.external_id, len(group.students) - 1),
+        )
+
+    def record_assignment(self, task: Task, student: Student):
+        """Queue a task assignment (call after assign_to_student)"""
+        self._write(
+            "assignment",
+            (task.external_id, student.external_id, len(task.assigned_students) - 1),
+        )
+
+    def record_status(self, task: Task):
+        self._write("status", (task.status, task.external_id))
+
+    def save_graph(self, supervisor: Supervisor):
+        """Queue the supervisor and everything reachable from its groups"""
+        self.save_supervisor(supervisor)
+        for group in supervisor.groups:
+            self.save_group(group)
+            for position, student in enumerate(group.students):
+                self.save_student(student)
+                self._write(
+                    "membership", (group.external_id, student.external_id, position)
+                )
+            for position, task in enumerate(group.tasks):
+                self.save_task(task, position)
+                for student_position, student in enumerate(task.assigned_students):
+                    self._write(
+                        "assignment",
+                        (task.external_id, student.external_id, student_position),
+                    )
+
+    # --- lazy loading -----------------------------------------------------
+
+    def _query(self, sql: str, params: Tuple = ()):
+        self.flush()
+        with self._pool.connection() as connection:
+            return connection.execute(sql, params).fetchall()
+
+    def get_supervisor(self, supervisor_id: str) -> Optional[Supervisor]:
+        """Load a supervisor by external id; its groups load with get_group"""
+        supervisor = self._supervisors.get(supervisor_id)
+        if supervisor is not None:
+            return supervisor
+        rows = self._query(
+            "SELECT name, email FROM supervisors WHERE id = ?", (supervisor_id,)
+        )
+        if not rows:
+            return None
+        with self._lock:
+            # another thread may have loaded it while we were querying
+            supervisor = self._supervisors.get(supervisor_id)
+            if supervisor is None:
+                supervisor = Supervisor(*rows[0], entity_id=restore_id(supervisor_id))
+                self._supervisors[supervisor_id] = supervisor
+            return supervisor
+
+    def group_ids(self, supervisor_id: str) -> List[str]:
+        """External ids of a supervisor's groups, without loading them"""
+        rows = self._query(
+            "SELECT id FROM groups WHERE supervisor_id = ? ORDER BY rowid",
+            (supervisor_id,),
+        )
+        return [row[0] for row in rows]
+
+    def get_group(self, group_id: str) -> Optional[Group]:
+        """Load a group by external id, with its students and tasks"""
+        group = self._groups.get(group_id)
+        if group is not None:
+            return group
+        rows = self._query(
+            "SELECT name, description, creation_date, supervisor_id"
+            " FROM groups WHERE id = ?",
+            (group_id,),
+        )
+        if not rows:
+            return None
+        supervisor = self.get_supervisor(rows[0][3])
+        student_rows = self._query(
+            "SELECT s.id, s.name, s.email FROM group_students m"
+            " JOIN students s ON s.id = m.student_id"
+            " WHERE m.group_id = ? ORDER BY m.seq",
+            (group_id,),
+        )
+        task_rows = self._query(
+            "SELECT id, title, description, deadline, creation_date, status"
+            " FROM tasks WHERE group_id = ? ORDER BY seq",
+            (group_id,),
+        )
+        assignment_rows = self._query(
+            "SELECT a.task_id, a.student_id FROM assignments a"
+            " JOIN tasks t ON t.id = a.task_id"
+            " WHERE t.group_id = ? ORDER BY a.task_id, a.seq",
+            (group_id,),
+        )
+        # the objects are built under the lock so two threads that queried
+        # the same group at once still end up sharing one Group
+        with self._lock:
+            group = self._groups.get(group_id)
+            if group is None:
+                group = self._build_group(
+                    group_id,
+                    rows[0],
+                    supervisor,
+                    student_rows,
+                    task_rows,
+                    assignment_rows,
+                )
+            return group
+
+    def _build_group(
+        self, group_id, row, supervisor, student_rows, task_rows, assignment_rows
+    ) -> Group:
+        name, description, creation_date, _ = row
+        group = Group(name, description, supervisor, entity_id=restore_id(group_id))
+        group.creation_date = _from_text(creation_date)
+        self._groups[group_id] = group
+
+        members = {
+            student_id: self._student(student_id, student_name, email)
+            for student_id, student_name, email in student_rows
+        }
+        group.enroll_students(members.values())
+
+        assignees: Dict[str, List[Student]] = {}
+        for task_id, student_id in assignment_rows:
+            # an assignee who is no longer a member is left out, as the model
+            # only assigns tasks to members
+            if student_id in members:
+                assignees.setdefault(task_id, []).append(members[student_id])
+
+        for task_id, title, description, deadline, creation_date, status in task_rows:
+            task = Task(
+                title,
+                description,
+                group,
+                _from_text(deadline),
+                entity_id=restore_id(task_id),
+            )
+            task.creation_date = _from_text(creation_date)
+            group.restore_task(task, status, assignees.get(task_id, ()))
+            self._tasks[task_id] = task
+        return group
+
+    def _student(self, student_id: str, name: str, email: str) -> Student:
+        student = self._students.get(student_id)
+        if student is None:
+            student = Student(name, email, entity_id=restore_id(student_id))
+            self._students[student_id] = student
+        return student
+
+    def get_task(self, task_id: str) -> Optional[Task]:
+        """Load a task by external id, loading its group if needed"""
+        task = self._tasks.get(task_id)
+        if task is None:
+            rows = self._query("SELECT group_id FROM tasks WHERE id = ?", (task_id,))
+            if not rows or self.get_group(rows[0][0]) is None:
+                return None
+            task = self._tasks.get(task_id)
+        return task
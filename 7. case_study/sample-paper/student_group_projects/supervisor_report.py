@@ -0,0 +1,165 @@
+import hashlib
+import json
+import os
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+
+from matplotlib.figure import Figure
+
+from canva_example_class import TASK_STATUSES, Supervisor
+
+STATUS_COLORS = {"Pending": "#c7c7c7", "In Progress": "#f0ad4e", "Completed": "#5cb85c"}
+
+
+class GroupSnapshot(NamedTuple):
+    group_id: str
+    name: str
+    # task counts in TASK_STATUSES order
+    status_counts: Tuple[int, ...]
+
+
+class SupervisorSnapshot(NamedTuple):
+    supervisor_id: str
+    name: str
+    groups: Tuple[GroupSnapshot, ...]
+
+
+class SupervisorReport(NamedTuple):
+    supervisor_id: str
+    name: str
+    # group external id -> share of completed tasks
+    completion_rates: Dict[str, float]
+    # group external id -> PNG chart of its task statuses
+    chart_paths: Dict[str, str]
+    # number of charts drawn for this report; the others came from the cache
+    rendered: int
+
+
+def snapshot(supervisor: Supervisor) -> SupervisorSnapshot:
+    """Copy what a report needs into plain tuples that pickle cheaply"""
+    return SupervisorSnapshot(
+        supervisor.external_id,
+        supervisor.name,
+        tuple(
+            GroupSnapshot(
+                group.external_id,
+                group.name,
+                tuple(group.status_counts[status] for status in TASK_STATUSES),
+            )
+            for group in supervisor.groups
+        ),
+    )
+
+
+def chart_key(group: GroupSnapshot) -> str:
+    """sha256 of everything drawn on a group's chart: its name and counters"""
+    content = [group.name, group.status_counts]
+    return hashlib.sha256(json.dumps(content).encode()).hexdigest()
+
+
+def render_chart(group: GroupSnapshot, path: str):
+    """Draw a stacked bar of the group's task statuses and save it as PNG"""
+    figure = Figure(figsize=(8, 1.4))
+    axes = figure.add_subplot()
+    left = 0
+    for count, status in zip(group.status_counts, TASK_STATUSES):
+        axes.barh(
+            [group.name], [count], left=left, color=STATUS_COLORS[status], label=status
+        )
+        left += count
+    axes.set_xlabel("Tasks")
+    axes.legend(loc="lower right", ncols=3, fontsize="small")
+    figure.subplots_adjust(left=0.2, bottom=0.35)
+    # write under a unique temporary name so a concurrent reader never sees
+    # half a file, even when threads render the same chart at once
+    temporary = tempfile.NamedTemporaryFile(
+        dir=os.path.dirname(path), suffix=".tmp", delete=False
+    )
+    try:
+        with temporary:
+            figure.savefig(temporary, format="png")
+        os.replace(temporary.name, path)
+    except BaseException:
+        os.unlink(temporary.name)
+        raise
+
+
+def build_report(supervisor: SupervisorSnapshot, cache_dir: str) -> SupervisorReport:
+    """Report on one supervisor, rendering only the group charts not cached"""
+    completion_rates = {}
+    chart_paths = {}
+    rendered = 0
+    for group in supervisor.groups:
+        total = sum(group.status_counts)
+        completed = group.status_counts[TASK_STATUSES.index("Completed")]
+        completion_rates[group.group_id] = completed / total if total > 0 else 0
+        path = os.path.join(cache_dir, f"{chart_key(group)}.png")
+        try:
+            # a hit marks the chart as recently used for prune_cache
+            os.utime(path)
+        except FileNotFoundError:
+            render_chart(group, path)
+            rendered += 1
+        chart_paths[group.group_id] = path
+    return SupervisorReport(
+        supervisor.supervisor_id,
+        supervisor.name,
+        completion_rates,
+        chart_paths,
+        rendered,
+    )
+
+
+def _build_reports(
+    supervisors: List[SupervisorSnapshot], cache_dir: str
+) -> List[SupervisorReport]:
+    return [build_report(supervisor, cache_dir) for supervisor in supervisors]
+
+
+def prune_cache(cache_dir: str, max_charts: int):
+    """Delete the least recently used charts beyond the newest max_charts"""
+    charts = sorted(
+        Path(cache_dir).glob("*.png"), key=lambda chart: chart.stat().st_mtime
+    )
+    for chart in charts[: max(len(charts) - max_charts, 0)]:
+        chart.unlink(missing_ok=True)
+
+
+def build_reports(
+    supervisors: Iterable[Supervisor],
+    cache_dir: str,
+    workers: Optional[int] = None,
+    batch_size: int = 32,
+    max_charts: Optional[int] = 10000,
+) -> List[SupervisorReport]:
+    """
+    Report on every supervisor, in the order given.
+
+    The status counters are snapshotted in this process; the reports and
+    charts are built in a pool of worker processes, batch_size supervisors
+    per job. Each group's chart is cached in cache_dir under the hash of its
+    content, so a group that did not change is not drawn again. Afterwards
+    the cache is pruned to the max_charts most recently used charts, which
+    should be at least the number of groups reported (None keeps them all).
+    workers=1 builds everything in this process.
+    """
+    Path(cache_dir).mkdir(parents=True, exist_ok=True)
+    snapshots = [snapshot(supervisor) for supervisor in supervisors]
+    if workers == 1:
+        reports = _build_reports(snapshots, cache_dir)
+    else:
+        batches = [
+            snapshots[start : start + batch_size]
+            for start in range(0, len(snapshots), batch_size)
+        ]
+        reports = []
+        with ProcessPoolExecutor(workers) as executor:
+            for batch in executor.map(
+                _build_reports, batches, [cache_dir] * len(batches)
+            ):
+                reports.extend(batch)
+    if max_charts is not None:
+        prune_cache(cache_dir, max_charts)
+    return reports
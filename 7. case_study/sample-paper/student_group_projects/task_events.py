@@ -0,0 +1,129 @@
+import asyncio
+import inspect
+from typing import Awaitable, Callable, List, Optional, Tuple
+
+from canva_example_class import (
+    StatusChange,
+    Supervisor,
+    add_status_observer,
+    remove_status_observer,
+)
+
+Subscriber = Callable[[StatusChange], Awaitable[None]]
+
+
+class TaskEventBus:
+    """
+    Pushes task status changes to async subscribers.
+
+    While started, every status change made through the model (update_status,
+    complete_task, assign_to_student, ...) is put on a bounded asyncio queue.
+    A worker task takes changes off the queue in order and awaits all the
+    matching subscribers of each change concurrently. Changes made from other
+    threads are handed to the event loop's thread; when the queue is full the
+    change is dropped and counted in dropped. Subscribers that raise (or
+    don't return an awaitable) are counted in failed and never stop the bus.
+    Changes made after the bus's event loop has closed are ignored.
+    """
+
+    def __init__(self, maxsize: int = 10000):
+        self._maxsize = maxsize
+        # (callback, supervisor or None for every change)
+        self._subscribers: List[Tuple[Subscriber, Optional[Supervisor]]] = []
+        self._queue: Optional[asyncio.Queue] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._worker: Optional[asyncio.Task] = None
+        self.dropped = 0
+        self.failed = 0
+
+    def subscribe(self, callback: Subscriber, supervisor: Optional[Supervisor] = None):
+        """Await callback(change) for changes in the supervisor's groups (or all)"""
+        if (callback, supervisor) not in self._subscribers:
+            self._subscribers.append((callback, supervisor))
+
+    def unsubscribe(
+        self, callback: Subscriber, supervisor: Optional[Supervisor] = None
+    ):
+        if (callback, supervisor) in self._subscribers:
+            self._subscribers.remove((callback, supervisor))
+
+    async def start(self):
+        """Start listening to status changes on the running event loop"""
+        if self._worker is None:
+            self._loop = asyncio.get_running_loop()
+            self._queue = asyncio.Queue(self._maxsize)
+            self._worker = asyncio.create_task(self._run())
+            add_status_observer(self._publish)
+
+    async def stop(self):
+        """Stop listening, after delivering the changes already queued"""
+        if self._worker is not None:
+            remove_status_observer(self._publish)
+            await self._queue.join()
+            self._worker.cancel()
+            try:
+                await self._worker
+            except asyncio.CancelledError:
+                pass
+            self._worker = None
+
+    async def __aenter__(self):
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info):
+        await self.stop()
+
+    async def drain(self):
+        """Wait until every queued change has been delivered"""
+        if self._queue is not None:
+            await self._queue.join()
+
+    def _publish(self, change: StatusChange):
+        if self._loop_is_current():
+            self._put(change)
+            return
+        try:
+            self._loop.call_soon_threadsafe(self._put, change)
+        except RuntimeError:
+            # the loop closed without stop(); nobody is left to deliver to
+            remove_status_observer(self._publish)
+            self.dropped += 1
+
+    def _loop_is_current(self):
+        try:
+            return asyncio.get_running_loop() is self._loop
+        except RuntimeError:
+            return False
+
+    def _put(self, change: StatusChange):
+        try:
+            self._queue.put_nowait(change)
+        except asyncio.QueueFull:
+            self.dropped += 1
+
+    async def _run(self):
+        while True:
+            change = await self._queue.get()
+            try:
+                supervisor = change.task.group.supervisor
+                callbacks = [
+                    callback
+                    for callback, wanted in self._subscribers
+                    if wanted is None or wanted is supervisor
+                ]
+                awaitables = []
+                for callback in callbacks:
+                    try:
+                        result = callback(change)
+                    except Exception:
+                        self.failed += 1
+                        continue
+                    if inspect.isawaitable(result):
+                        awaitables.append(result)
+                    else:
+                        self.failed += 1
+                results = await asyncio.gather(*awaitables, return_exceptions=True)
+                self.failed += sum(isinstance(result, Exception) for result in results)
+            finally:
+                self._queue.task_done()
@@ -0,0 +1,131 @@
+from datetime import date, datetime, timedelta, timezone
+from typing import Iterable, Optional, Union
+
+import numpy as np
+import pandas as pd
+
+from canva_example_class import TASK_STATUSES, Supervisor, Task
+
+COLUMNS = [
+    "task_id",
+    "group_id",
+    "supervisor_id",
+    "status",
+    "deadline",
+    "creation_date",
+    "assignee_count",
+]
+
+
+def _timestamp(value: Union[date, datetime, None]):
+    """
+    A date or datetime as a naive UTC Timestamp, the way the model orders
+    deadlines: naive values are taken as UTC, aware ones converted to it.
+    """
+    if value is None:
+        return pd.NaT
+    timestamp = pd.Timestamp(value)
+    if timestamp.tzinfo is not None:
+        timestamp = timestamp.tz_convert(timezone.utc).tz_localize(None)
+    return timestamp
+
+
+def _now(now: Optional[datetime]):
+    return _timestamp(now or datetime.now(timezone.utc))
+
+
+def _row(task: Task):
+    return {
+        "task_id": task.id,
+        "group_id": task.group.id,
+        "supervisor_id": task.group.supervisor.id,
+        "status": task.status,
+        "deadline": task.deadline,
+        "creation_date": task.creation_date,
+        "assignee_count": len(task.assigned_students),
+    }
+
+
+class TaskStore:
+    """
+    Columnar copy of Task objects for vectorized analytics queries.
+
+    Deadlines are stored as naive UTC timestamps, so date, naive and aware
+    deadlines can be mixed; the now, start and end arguments of the queries
+    are converted the same way.
+    """
+
+    def __init__(self, frame: Optional[pd.DataFrame] = None):
+        if frame is None:
+            frame = pd.DataFrame(columns=COLUMNS)
+        self.frame = self._normalize(frame)
+
+    @classmethod
+    def from_supervisors(cls, supervisors: Iterable[Supervisor]):
+        """Build a store from every task of every group of the supervisors"""
+        columns = {column: [] for column in COLUMNS}
+        for supervisor in supervisors:
+            for group in supervisor.groups:
+                for task in group.tasks:
+                    for column, value in _row(task).items():
+                        columns[column].append(value)
+        return cls(pd.DataFrame(columns))
+
+    @staticmethod
+    def _normalize(frame: pd.DataFrame):
+        frame = frame.set_index("task_id", drop=False)
+        frame.index.name = None
+        frame["status"] = pd.Categorical(frame["status"], categories=TASK_STATUSES)
+        deadline = pd.to_datetime(frame["deadline"], errors="coerce", utc=True)
+        frame["deadline"] = deadline.dt.tz_convert(None)
+        frame["creation_date"] = pd.to_datetime(frame["creation_date"])
+        frame["assignee_count"] = frame["assignee_count"].astype(np.int64)
+        return frame
+
+    def __len__(self):
+        return len(self.frame)
+
+    def add_task(self, task: Task):
+        """Add a task created after the store was built (or sync it if present)"""
+        if task.id in self.frame.index:
+            self.sync_task(task)
+            return
+        row = self._normalize(pd.DataFrame([_row(task)], columns=COLUMNS))
+        # concat with an empty frame would lose the column dtypes
+        self.frame = pd.concat([self.frame, row]) if len(self.frame) else row
+
+    def sync_task(self, task: Task):
+        """Copy a task's status, deadline and assignee count into the store"""
+        if task.id not in self.frame.index:
+            raise KeyError(f"Task {task.id} is not in the store")
+        self.frame.at[task.id, "status"] = task.status
+        self.frame.at[task.id, "deadline"] = _timestamp(task.deadline)
+        self.frame.at[task.id, "assignee_count"] = len(task.assigned_students)
+
+    def overdue_per_group(self, now: Optional[datetime] = None):
+        """Number of unfinished tasks past their deadline, per group id"""
+        now = _now(now)
+        frame = self.frame
+        overdue = (frame["deadline"] < now) & (frame["status"] != "Completed")
+        return frame.loc[overdue, "group_id"].value_counts().rename("overdue")
+
+    def completion_rate_per_supervisor(self):
+        """Share of completed tasks, per supervisor id"""
+        completed = (self.frame["status"] == "Completed").astype(np.float64)
+        return (
+            completed.groupby(self.frame["supervisor_id"])
+            .mean()
+            .rename("completion_rate")
+        )
+
+    def due_between(self, start: datetime, end: datetime):
+        """Tasks with a deadline in [start, end), earliest first"""
+        deadline = self.frame["deadline"]
+        due = (deadline >= _timestamp(start)) & (deadline < _timestamp(end))
+        return self.frame[due].sort_values("deadline")
+
+    def due_this_week(self, now: Optional[datetime] = None):
+        """Tasks due in the calendar week (Monday to Sunday) containing now"""
+        now = _now(now)
+        start = now.normalize() - timedelta(days=now.weekday())
+        return self.due_between(start, start + timedelta(days=7))
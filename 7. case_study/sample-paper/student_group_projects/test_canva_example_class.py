@@ -0,0 +1,489 @@
+import gc
+import os
+import random
+import threading
+import time
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from canva_example_class import (
+    TASK_STATUSES,
+    IdAllocator,
+    LockStripes,
+    Group,
+    Student,
+    Supervisor,
+    Task,
+    add_status_observer,
+    global_deadlines,
+    remove_status_observer,
+    restore_id,
+    use_compact_ids,
+    use_global_deadlines,
+    use_thread_safety,
+)
+
+
+class TestMembership(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = Supervisor("Dr. Smith", "smith@university.edu")
+        self.group = Group("Team Alpha", "Project", self.supervisor)
+        self.alice = Student("Alice", "alice@university.edu")
+        self.bob = Student("Bob", "bob@university.edu")
+
+    def test_add_student_once(self):
+        self.assertTrue(self.group.add_student(self.alice))
+        self.assertFalse(self.group.add_student(self.alice))
+        self.assertEqual([self.alice], self.group.students)
+        self.assertEqual([self.group], self.alice.groups)
+
+    def test_join_group(self):
+        self.assertTrue(self.bob.join_group(self.group))
+        self.assertFalse(self.bob.join_group(self.group))
+        self.assertEqual([self.bob], self.group.students)
+        self.assertEqual([self.group], self.bob.groups)
+
+    def test_assign_only_members(self):
+        self.group.add_student(self.alice)
+        task = self.group.create_task("Design", "UML diagram")
+        self.assertFalse(self.group.assign_task(task, [self.alice, self.bob]))
+        self.assertEqual([], task.assigned_students)
+        self.assertTrue(self.group.assign_task(task, [self.alice]))
+        self.assertFalse(task.assign_to_student(self.alice))
+        self.assertEqual([self.alice], task.assigned_students)
+        self.assertEqual([task], self.alice.assigned_tasks)
+
+    def test_complete_only_assigned_tasks(self):
+        self.group.add_student(self.alice)
+        task = self.group.create_task("Design", "UML diagram")
+        self.assertFalse(self.alice.complete_task(task))
+        self.assertEqual("Pending", task.status)
+        task.assign_to_student(self.alice)
+        self.assertTrue(self.alice.complete_task(task))
+        self.assertEqual("Completed", task.status)
+
+    def test_supervisor_sees_only_own_groups(self):
+        other = Group("Team Beta", "Project", Supervisor("Dr. Jones", "j@u.edu"))
+        self.assertTrue(self.supervisor.monitor_group(self.group))
+        self.assertFalse(self.supervisor.monitor_group(other))
+        self.assertIsNone(self.supervisor.review_progress(other))
+
+
+class TestStatusCounts(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = Supervisor("Dr. Smith", "smith@university.edu")
+        self.group = Group("Team Alpha", "Project", self.supervisor)
+        self.alice = Student("Alice", "alice@university.edu")
+        self.group.add_student(self.alice)
+        self.tasks = [self.group.create_task(f"Task {n}", "") for n in range(4)]
+
+    def test_counters_follow_status_changes(self):
+        self.assertEqual(
+            {"Pending": 4, "In Progress": 0, "Completed": 0}, self.group.status_counts
+        )
+        self.tasks[0].assign_to_student(self.alice)
+        self.tasks[1].update_status("Completed")
+        self.tasks[1].update_status("Completed")
+        self.assertFalse(self.tasks[2].update_status("Done"))
+        self.assertEqual(
+            {"Pending": 2, "In Progress": 1, "Completed": 1}, self.group.status_counts
+        )
+
+    def test_completion_rate(self):
+        empty = Group("Empty", "", self.supervisor)
+        self.assertEqual(0, empty.completion_rate())
+        self.tasks[0].update_status("Completed")
+        self.assertEqual(0.25, self.group.completion_rate())
+        self.assertEqual(0.25, self.supervisor.review_progress(self.group))
+        self.assertEqual(
+            {self.group.id: 0.25, empty.id: 0}, self.supervisor.review_all_progress()
+        )
+
+
+class TestCompactIds(unittest.TestCase):
+    def tearDown(self):
+        use_compact_ids(False)
+
+    def test_uuid_ids_by_default(self):
+        student = Student("Alice", "alice@university.edu")
+        self.assertIsInstance(student.id, str)
+        self.assertEqual(student.id, student.external_id)
+
+    def test_switching_again_does_not_reuse_ids(self):
+        use_compact_ids()
+        group = Group("Team Alpha", "Project", Supervisor("Dr. Smith", "s@u.edu"))
+        alice = Student("Alice", "alice@university.edu")
+        group.add_student(alice)
+        use_compact_ids()
+        bob = Student("Bob", "bob@university.edu")
+        self.assertIsInstance(bob.id, int)
+        self.assertNotIn(bob.id, (group.id, alice.id, group.supervisor.id))
+        self.assertTrue(group.add_student(bob))
+
+    def test_external_id_is_stable(self):
+        use_compact_ids()
+        task = Task("Design", "", Group("Team", "", Supervisor("Dr. Smith", "")))
+        self.assertEqual(task.external_id, task.external_id)
+        restored = restore_id(task.external_id)
+        self.assertNotEqual(task.id, restored)
+        copy = Task("Design", "", task.group, entity_id=restored)
+        self.assertEqual(task.external_id, copy.external_id)
+
+    def test_external_ids_are_released_with_their_objects(self):
+        class Entity:
+            def __init__(self, allocator, entity_id=None):
+                self.id = allocator.claim(self, entity_id)
+
+        allocator = IdAllocator(compact=True)
+        asked = Entity(allocator)
+        uuid = allocator.external_id(asked)
+        restored = Entity(allocator, allocator.restore("saved-uuid"))
+        copy = Entity(allocator, restored.id)
+        self.assertEqual(uuid, allocator.external_id(asked))
+        self.assertEqual("saved-uuid", allocator.external_id(copy))
+        self.assertEqual(2, len(allocator))
+        # only the object the uuid was created or restored for releases it
+        del asked, copy
+        gc.collect()
+        self.assertEqual(1, len(allocator))
+        del restored
+        gc.collect()
+        self.assertEqual(0, len(allocator))
+
+    def test_statuses_are_shared(self):
+        group = Group("Team", "", Supervisor("Dr. Smith", ""))
+        first, second = group.create_task("A", ""), group.create_task("B", "")
+        first.update_status("".join(["Compl", "eted"]))
+        second.update_status("".join(["Compl", "eted"]))
+        self.assertIs(first.status, second.status)
+        with self.assertRaises(AttributeError):
+            first.notes = "no such attribute"
+
+
+class TestBulkOperations(unittest.TestCase):
+    def setUp(self):
+        self.group = Group("Team Alpha", "Project", Supervisor("Dr. Smith", ""))
+        self.students = [Student(f"Student {n}", "") for n in range(3)]
+
+    def test_enroll_students(self):
+        self.group.add_student(self.students[0])
+        self.assertEqual(2, self.group.enroll_students(iter(self.students)))
+        self.assertEqual(self.students, self.group.students)
+        for student in self.students:
+            self.assertEqual([self.group], student.groups)
+
+    def test_create_tasks(self):
+        deadline = datetime(2030, 1, 1)
+        first, second = self.group.create_tasks(
+            [("Design", "UML"), ("Build", "Code", deadline)]
+        )
+        self.assertEqual([first, second], self.group.tasks)
+        self.assertIsNone(first.deadline)
+        self.assertEqual(deadline, second.deadline)
+        self.assertEqual(2, self.group.status_counts["Pending"])
+
+    def test_create_tasks_rejects_bad_rows(self):
+        for row in [("Design",), ("Design", "UML", None, "extra-id")]:
+            with self.assertRaises(ValueError):
+                self.group.create_tasks([("Build", "Code"), row])
+        self.assertEqual([], self.group.tasks)
+        self.assertEqual(0, self.group.status_counts["Pending"])
+
+    def test_assign_tasks(self):
+        self.group.enroll_students(self.students[:2])
+        first, second = self.group.create_tasks([("A", ""), ("B", "")])
+        outsider = self.students[2]
+        self.assertFalse(self.group.assign_tasks({first: [outsider]}))
+        self.assertTrue(
+            self.group.assign_tasks(
+                {first: self.students[:2], second: [self.students[0]] * 2}
+            )
+        )
+        self.assertEqual(self.students[:2], first.assigned_students)
+        self.assertEqual([self.students[0]], second.assigned_students)
+        self.assertEqual([first, second], self.students[0].assigned_tasks)
+        self.assertEqual(2, self.group.status_counts["In Progress"])
+
+
+class TestDeadlines(unittest.TestCase):
+    def setUp(self):
+        self.group = Group("Team Alpha", "Project", Supervisor("Dr. Smith", ""))
+        use_global_deadlines()
+
+    def tearDown(self):
+        use_global_deadlines(False)
+
+    def test_global_index_is_opt_in(self):
+        use_global_deadlines(False)
+        task = self.group.create_task("Design", "", datetime(2030, 1, 1))
+        self.assertNotIn(task, global_deadlines)
+        use_global_deadlines()
+        later = self.group.create_task("Build", "", datetime(2030, 1, 2))
+        self.assertEqual([later], global_deadlines.next_due(5))
+        use_global_deadlines(False)
+        self.assertEqual(0, len(global_deadlines))
+        self.assertEqual([task, later], self.group.deadlines.next_due(5))
+
+    def test_overdue_defaults_to_utc_now(self):
+        old_tz = os.environ.get("TZ")
+        # five hours ahead of UTC, so local and UTC time disagree
+        os.environ["TZ"] = "Etc/GMT-5"
+        time.tzset()
+        try:
+            now = datetime.now(timezone.utc)
+            past = self.group.create_task("Past", "", now - timedelta(hours=1))
+            self.group.create_task("Future", "", now + timedelta(hours=1))
+            naive = now.replace(tzinfo=None) + timedelta(hours=2)
+            self.group.create_task("Naive UTC", "", naive)
+            self.assertEqual([past], self.group.deadlines.overdue())
+        finally:
+            if old_tz is None:
+                del os.environ["TZ"]
+            else:
+                os.environ["TZ"] = old_tz
+            time.tzset()
+
+    def test_queries(self):
+        late, early, _ = self.group.create_tasks(
+            [
+                ("Late", "", datetime(2030, 1, 3)),
+                ("Early", "", datetime(2030, 1, 1)),
+                ("No deadline", ""),
+            ]
+        )
+        self.assertEqual([early, late], self.group.deadlines.next_due(5))
+        self.assertEqual(
+            [late], self.group.deadlines.next_due(5, now=datetime(2030, 1, 2))
+        )
+        self.assertEqual(
+            [early], self.group.deadlines.overdue(now=datetime(2030, 1, 2))
+        )
+        self.assertEqual(
+            [late],
+            self.group.deadlines.due_between(datetime(2030, 1, 2), date(2030, 1, 4)),
+        )
+        self.assertIn(early, global_deadlines)
+
+    def test_completed_and_moved_tasks(self):
+        task = self.group.create_task("Design", "", datetime(2030, 1, 1))
+        task.update_status("Completed")
+        self.assertNotIn(task, self.group.deadlines)
+        self.assertNotIn(task, global_deadlines)
+        task.update_status("Pending")
+        task.set_deadline(datetime(2030, 2, 1))
+        self.assertEqual([task], self.group.deadlines.next_due(1))
+        self.assertEqual(datetime(2030, 2, 1), task.deadline)
+        task.set_deadline(None)
+        self.assertNotIn(task, self.group.deadlines)
+
+    def test_dates_and_datetimes_mix(self):
+        timed = self.group.create_task("Timed", "", datetime(2030, 1, 2, 9))
+        dated = self.group.create_task("Dated", "", date(2030, 1, 2))
+        aware = self.group.create_task(
+            "Aware",
+            "",
+            datetime(2030, 1, 2, 10, tzinfo=timezone(timedelta(hours=2))),
+        )
+        self.assertEqual([dated, aware, timed], self.group.deadlines.next_due(3))
+
+    def test_bad_deadline_changes_nothing(self):
+        with self.assertRaises(TypeError):
+            self.group.create_task("Bad", "", "tomorrow")
+        with self.assertRaises(TypeError):
+            self.group.create_tasks([("Good", "", date(2030, 1, 1)), ("Bad", "", 1)])
+        self.assertEqual([], self.group.tasks)
+        self.assertEqual(0, self.group.status_counts["Pending"])
+        task = self.group.create_task("Good", "", date(2030, 1, 1))
+        with self.assertRaises(TypeError):
+            task.set_deadline("tomorrow")
+        self.assertEqual(date(2030, 1, 1), task.deadline)
+
+    def test_copies_with_the_same_id(self):
+        original = self.group.create_task("Design", "", datetime(2030, 1, 1))
+        other_group = Group("Team Alpha", "Project", self.group.supervisor)
+        copy = Task(
+            "Design", "", other_group, datetime(2030, 1, 1), entity_id=original.id
+        )
+        other_group.add_task(copy)
+        copy.update_status("Completed")
+        self.assertIn(original, global_deadlines)
+        self.assertNotIn(copy, global_deadlines)
+
+
+class TestStatusObservers(unittest.TestCase):
+    def setUp(self):
+        self.group = Group("Team Alpha", "Project", Supervisor("Dr. Smith", ""))
+        self.alice = Student("Alice", "alice@university.edu")
+        self.group.add_student(self.alice)
+        self.design, self.review = self.group.create_tasks([("A", ""), ("B", "")])
+        self.observers = []
+
+    def tearDown(self):
+        for observer in self.observers:
+            remove_status_observer(observer)
+        use_thread_safety(False)
+
+    def observe(self, observer):
+        add_status_observer(observer)
+        self.observers.append(observer)
+
+    def test_observers_see_every_change(self):
+        changes = []
+        self.observe(changes.append)
+        self.observe(changes.append)
+        self.group.assign_tasks({self.design: [self.alice]})
+        self.alice.complete_task(self.design)
+        self.review.update_status("Pending")
+        self.assertEqual(
+            [
+                (self.design, "Pending", "In Progress"),
+                (self.design, "In Progress", "Completed"),
+            ],
+            changes,
+        )
+
+    def test_failing_observer_does_not_break_the_change(self):
+        changes = []
+
+        def failing(change):
+            raise RuntimeError("observer failed")
+
+        self.observe(failing)
+        self.observe(changes.append)
+        with self.assertLogs("canva_example_class", "ERROR"):
+            self.assertTrue(self.design.update_status("Completed"))
+        self.assertEqual("Completed", self.design.status)
+        self.assertEqual(1, self.group.status_counts["Completed"])
+        self.assertEqual(1, len(changes))
+
+    def test_observers_run_after_stripes_are_released(self):
+        use_thread_safety(True, stripes=1)
+        finished = []
+
+        def change_from_another_thread(change):
+            # would block forever if this thread still held the stripe
+            worker = threading.Thread(
+                target=self.review.update_status, args=("Completed",)
+            )
+            worker.start()
+            worker.join(timeout=2)
+            finished.append(not worker.is_alive())
+
+        self.observe(change_from_another_thread)
+        self.design.assign_to_student(self.alice)
+        self.assertEqual([True], finished[:1])
+
+
+class TestThreadSafety(unittest.TestCase):
+    def setUp(self):
+        use_thread_safety(True, stripes=8)
+        supervisor = Supervisor("Dr. Smith", "")
+        self.groups = [Group(f"Group {n}", "", supervisor) for n in range(4)]
+        for group in self.groups:
+            group.create_tasks((f"Task {n}", "") for n in range(5))
+        self.students = [Student(f"Student {n}", "") for n in range(10)]
+
+    def tearDown(self):
+        use_thread_safety(False)
+
+    def work(self, seed):
+        rng = random.Random(seed)
+        for _ in range(2000):
+            group = rng.choice(self.groups)
+            student = rng.choice(self.students)
+            task = rng.choice(group.tasks)
+            action = rng.randrange(4)
+            if action == 0:
+                group.add_student(student)
+            elif action == 1:
+                student.join_group(group)
+            elif action == 2:
+                task.assign_to_student(student)
+            else:
+                task.update_status(rng.choice(TASK_STATUSES))
+
+    def test_concurrent_changes_keep_the_graph_consistent(self):
+        threads = [threading.Thread(target=self.work, args=(n,)) for n in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        for group in self.groups:
+            counts = {status: 0 for status in TASK_STATUSES}
+            for task in group.tasks:
+                counts[task.status] += 1
+                for student in task.assigned_students:
+                    self.assertIn(task, student.assigned_tasks)
+            self.assertEqual(counts, group.status_counts)
+            self.assertEqual(len(set(map(id, group.students))), len(group.students))
+            for student in group.students:
+                self.assertEqual(1, student.groups.count(group))
+        for student in self.students:
+            for task in student.assigned_tasks:
+                self.assertEqual(1, task.assigned_students.count(student))
+
+    def test_stripes_block_other_threads(self):
+        stripes = LockStripes(4)
+        first, second = self.students[:2]
+        acquired = threading.Event()
+
+        def hold_second():
+            with stripes.hold(second):
+                acquired.set()
+
+        with stripes.hold(second, first, first):
+            # re-entrant, so nested operations on the same objects work
+            with stripes.hold(first):
+                worker = threading.Thread(target=hold_second)
+                worker.start()
+                self.assertFalse(acquired.wait(0.05))
+        worker.join(timeout=2)
+        self.assertTrue(acquired.is_set())
+
+
+class TestCoAssignments(unittest.TestCase):
+    def setUp(self):
+        self.group = Group("Team Alpha", "Project", Supervisor("Dr. Smith", ""))
+        self.students = [Student(f"Student {n}", "") for n in range(5)]
+        self.group.enroll_students(self.students)
+        self.tasks = self.group.create_tasks((f"Task {n}", "") for n in range(4))
+
+    def test_partners_and_workloads(self):
+        a, b, c, d, e = self.students
+        self.group.assign_task(self.tasks[0], [a, b])
+        self.group.assign_tasks({self.tasks[1]: [a, b, c], self.tasks[2]: [d]})
+        index = self.group.co_assignments
+        self.assertEqual({b.id: 2, c.id: 1}, index.partners(a))
+        self.assertEqual({}, index.partners(d))
+        self.assertEqual({}, index.partners(e))
+        self.assertEqual(2, index.workload(a))
+        self.assertEqual(0, index.workload(e))
+
+        a.complete_task(self.tasks[0])
+        self.assertEqual(1, index.workload(a))
+        self.assertEqual({a.id: 1, b.id: 1, c.id: 1, d.id: 1}, index.workloads())
+        # reopening a completed task counts it again
+        self.tasks[0].update_status("Pending")
+        self.assertEqual(2, index.workload(b))
+
+    def test_assigning_a_completed_task(self):
+        a, b = self.students[:2]
+        self.tasks[3].update_status("Completed")
+        self.tasks[3].assign_to_student(a)
+        self.assertEqual(1, self.group.co_assignments.workload(a))
+        self.tasks[3].update_status("Completed")
+        self.group.assign_tasks({self.tasks[3]: [b]})
+        self.assertEqual(1, self.group.co_assignments.workload(a))
+        self.assertEqual(1, self.group.co_assignments.workload(b))
+
+    def test_teams(self):
+        a, b, c, d, e = self.students
+        self.group.assign_task(self.tasks[0], [a, b])
+        self.group.assign_task(self.tasks[1], [c, d])
+        self.assertEqual([[a, b], [c, d], [e]], self.group.teams())
+        self.group.assign_task(self.tasks[2], [d, b])
+        self.assertEqual([[a, b, c, d], [e]], self.group.teams())
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+import os
+import shutil
+import sqlite3
+import tempfile
+import threading
+import unittest
+from datetime import date, datetime
+
+from canva_example_class import (
+    Group,
+    Student,
+    Supervisor,
+    add_status_observer,
+    global_deadlines,
+    remove_status_observer,
+    use_compact_ids,
+    use_global_deadlines,
+)
+from project_repository import ProjectRepository
+
+
+class TestProjectRepository(unittest.TestCase):
+    def setUp(self):
+        self.directory = tempfile.mkdtemp()
+        self.path = os.path.join(self.directory, "projects.db")
+        self.supervisor = Supervisor("Dr. Smith", "smith@university.edu")
+        self.group = Group("Team Alpha", "Project", self.supervisor)
+        self.alice = Student("Alice", "alice@university.edu")
+        self.bob = Student("Bob", "bob@university.edu")
+        self.group.enroll_students([self.alice, self.bob])
+        self.design, self.build = self.group.create_tasks(
+            [("Design", "UML"), ("Build", "Code", datetime(2030, 1, 1))]
+        )
+        self.group.assign_task(self.design, [self.bob, self.alice])
+        self.alice.complete_task(self.design)
+        self.group.assign_task(self.build, [self.alice])
+
+    def tearDown(self):
+        use_compact_ids(False)
+        shutil.rmtree(self.directory)
+
+    def save(self, **options):
+        with ProjectRepository(self.path, **options) as repository:
+            repository.save_graph(self.supervisor)
+
+    def assert_same_group(self, group):
+        self.assertIsNot(self.group, group)
+        self.assertEqual(self.group.external_id, group.external_id)
+        self.assertEqual(self.group.name, group.name)
+        self.assertEqual(self.group.creation_date, group.creation_date)
+        self.assertEqual(["Alice", "Bob"], [s.name for s in group.students])
+        self.assertEqual(
+            [(t.title, t.status, t.deadline) for t in self.group.tasks],
+            [(t.title, t.status, t.deadline) for t in group.tasks],
+        )
+        self.assertEqual(
+            [["Bob", "Alice"], ["Alice"]],
+            [[s.name for s in t.assigned_students] for t in group.tasks],
+        )
+        self.assertEqual(self.group.status_counts, group.status_counts)
+
+    def test_round_trip(self):
+        self.save()
+        with ProjectRepository(self.path) as repository:
+            self.assertEqual(
+                [self.group.external_id],
+                repository.group_ids(self.supervisor.external_id),
+            )
+            group = repository.get_group(self.group.external_id)
+            self.assert_same_group(group)
+            self.assertIs(group, repository.get_group(self.group.external_id))
+            self.assertIs(
+                group.supervisor,
+                repository.get_supervisor(self.supervisor.external_id),
+            )
+            self.assertIsNone(repository.get_group("missing"))
+
+    def test_round_trip_with_compact_ids(self):
+        self.save()
+        use_compact_ids()
+        with ProjectRepository(self.path) as repository:
+            group = repository.get_group(self.group.external_id)
+            self.assertIsInstance(group.id, int)
+            self.assert_same_group(group)
+
+    def test_lazy_get_task(self):
+        self.save()
+        with ProjectRepository(self.path) as repository:
+            task = repository.get_task(self.build.external_id)
+            self.assertEqual("Build", task.title)
+            self.assertIs(task.group, repository.get_group(self.group.external_id))
+            self.assertIsNone(repository.get_task("missing"))
+
+    def test_writes_keep_their_order_across_batches(self):
+        with ProjectRepository(self.path, batch_size=3) as repository:
+            repository.save_supervisor(self.supervisor)
+            repository.save_group(self.group)
+            for student in self.group.students:
+                repository.save_student(student)
+                repository.record_membership(self.group, student)
+            task = self.group.create_task("Review", "")
+            repository.save_task(task)
+            task.update_status("Completed")
+            repository.record_status(task)
+            task.update_status("In Progress")
+            repository.record_status(task)
+        with ProjectRepository(self.path) as repository:
+            loaded = repository.get_task(task.external_id)
+            self.assertEqual("In Progress", loaded.status)
+
+    def test_loading_publishes_no_events_and_indexes_once(self):
+        self.save()
+        changes = []
+        add_status_observer(changes.append)
+        use_global_deadlines()
+        try:
+            with ProjectRepository(self.path) as repository:
+                group = repository.get_group(self.group.external_id)
+            self.assertIn(group.tasks[1], global_deadlines)
+        finally:
+            remove_status_observer(changes.append)
+            use_global_deadlines(False)
+        self.assertEqual([], changes)
+        self.assertEqual([group.tasks[1]], group.deadlines.next_due(5))
+        self.assertEqual(1, group.co_assignments.workload(group.students[0]))
+
+    def test_date_deadlines_keep_their_type(self):
+        self.build.set_deadline(date(2030, 1, 1))
+        self.save()
+        with ProjectRepository(self.path) as repository:
+            task = repository.get_task(self.build.external_id)
+            self.assertEqual(date(2030, 1, 1), task.deadline)
+            self.assertNotIsInstance(task.deadline, datetime)
+
+    def test_failed_batch_is_discarded(self):
+        repository = ProjectRepository(self.path, batch_size=2)
+        repository.save_supervisor(self.supervisor)
+        with self.assertRaises(sqlite3.IntegrityError):
+            # email is NOT NULL
+            repository.save_student(Student("Nobody", None))
+        repository.save_student(self.alice)
+        repository.close()
+        with ProjectRepository(self.path) as repository:
+            self.assertEqual([], repository._query("SELECT id FROM supervisors"))
+            self.assertEqual(
+                [(self.alice.external_id,)],
+                repository._query("SELECT id FROM students"),
+            )
+
+    def test_assignee_who_left_the_group_is_skipped(self):
+        self.save()
+        outsider = Student("Carol", "carol@university.edu")
+        with ProjectRepository(self.path) as repository:
+            repository.save_student(outsider)
+            repository._write(
+                "assignment", (self.build.external_id, outsider.external_id, 1)
+            )
+        with ProjectRepository(self.path) as repository:
+            task = repository.get_task(self.build.external_id)
+            self.assertEqual(["Alice"], [s.name for s in task.assigned_students])
+
+    def test_concurrent_loads_share_one_group(self):
+        self.save()
+        with ProjectRepository(self.path) as repository:
+            groups = []
+            threads = [
+                threading.Thread(
+                    target=lambda: groups.append(
+                        repository.get_group(self.group.external_id)
+                    )
+                )
+                for _ in range(8)
+            ]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(1, len({id(group) for group in groups}))
+            self.assertEqual(1, len(groups[0].supervisor.groups))
+
+
+if __name__ == "__main__":
+    unittest.main()
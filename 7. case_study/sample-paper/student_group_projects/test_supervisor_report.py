@@ -0,0 +1,90 @@
+import os
+import shutil
+import tempfile
+import unittest
+
+from canva_example_class import Group, Supervisor
+from supervisor_report import build_reports, chart_key, prune_cache, snapshot
+
+
+class TestSupervisorReport(unittest.TestCase):
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+        self.smith = Supervisor("Dr. Smith", "smith@university.edu")
+        self.jones = Supervisor("Dr. Jones", "jones@university.edu")
+        self.alpha = Group("Team Alpha", "", self.smith)
+        self.beta = Group("Team Beta", "", self.jones)
+        first, second = self.alpha.create_tasks([("A", ""), ("B", "")])
+        first.update_status("Completed")
+        self.review = self.beta.create_task("Review", "")
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_snapshot_and_key(self):
+        before = snapshot(self.smith)
+        self.assertEqual(self.smith.external_id, before.supervisor_id)
+        self.assertEqual((1, 0, 1), before.groups[0].status_counts)
+        group = before.groups[0]
+        self.assertEqual(chart_key(group), chart_key(snapshot(self.smith).groups[0]))
+        self.alpha.tasks[1].update_status("In Progress")
+        self.assertNotEqual(chart_key(group), chart_key(snapshot(self.smith).groups[0]))
+
+    def test_reports_render_once(self):
+        reports = build_reports([self.smith, self.jones], self.cache_dir, workers=1)
+        self.assertEqual(["Dr. Smith", "Dr. Jones"], [r.name for r in reports])
+        self.assertEqual({self.alpha.external_id: 0.5}, reports[0].completion_rates)
+        self.assertEqual([1, 1], [r.rendered for r in reports])
+        for report in reports:
+            for path in report.chart_paths.values():
+                with open(path, "rb") as chart:
+                    self.assertEqual(b"\x89PNG", chart.read(4))
+
+        # only the group that changed is drawn again
+        self.review.update_status("Completed")
+        again = build_reports([self.smith, self.jones], self.cache_dir, workers=1)
+        self.assertEqual([0, 1], [r.rendered for r in again])
+        self.assertEqual(reports[0].chart_paths, again[0].chart_paths)
+        self.assertEqual({self.beta.external_id: 1.0}, again[1].completion_rates)
+        self.assertEqual(3, len(os.listdir(self.cache_dir)))
+
+    def test_unchanged_groups_of_a_supervisor_are_not_redrawn(self):
+        gamma = Group("Team Gamma", "", self.smith)
+        task = gamma.create_task("Plan", "")
+        first = build_reports([self.smith], self.cache_dir, workers=1)[0]
+        self.assertEqual(2, first.rendered)
+        task.update_status("Completed")
+        second = build_reports([self.smith], self.cache_dir, workers=1)[0]
+        self.assertEqual(1, second.rendered)
+        self.assertEqual(
+            first.chart_paths[self.alpha.external_id],
+            second.chart_paths[self.alpha.external_id],
+        )
+
+    def test_cache_is_pruned(self):
+        build_reports([self.smith, self.jones], self.cache_dir, workers=1)
+        self.review.update_status("Completed")
+        reports = build_reports(
+            [self.smith, self.jones], self.cache_dir, workers=1, max_charts=2
+        )
+        paths = [path for r in reports for path in r.chart_paths.values()]
+        self.assertEqual(
+            sorted(os.path.basename(path) for path in paths),
+            sorted(os.listdir(self.cache_dir)),
+        )
+        prune_cache(self.cache_dir, 0)
+        self.assertEqual([], os.listdir(self.cache_dir))
+
+    def test_process_pool_keeps_order(self):
+        supervisors = [self.smith, self.jones] * 3
+        reports = build_reports(supervisors, self.cache_dir, workers=2, batch_size=2)
+        self.assertEqual(
+            [s.external_id for s in supervisors], [r.supervisor_id for r in reports]
+        )
+        for report in reports:
+            for path in report.chart_paths.values():
+                self.assertTrue(os.path.exists(path))
+
+
+if __name__ == "__main__":
+    unittest.main()
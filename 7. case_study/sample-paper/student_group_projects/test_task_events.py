@@ -0,0 +1,122 @@
+import asyncio
+import threading
+import unittest
+
+from canva_example_class import Group, Student, Supervisor
+from task_events import TaskEventBus
+
+
+class TestTaskEventBus(unittest.TestCase):
+    def setUp(self):
+        self.smith = Supervisor("Dr. Smith", "smith@university.edu")
+        self.jones = Supervisor("Dr. Jones", "jones@university.edu")
+        self.alpha = Group("Team Alpha", "", self.smith)
+        self.beta = Group("Team Beta", "", self.jones)
+        self.alice = Student("Alice", "alice@university.edu")
+        self.alpha.add_student(self.alice)
+        self.design = self.alpha.create_task("Design", "")
+        self.review = self.beta.create_task("Review", "")
+
+    def test_changes_reach_matching_subscribers(self):
+        everything, smith_only = [], []
+
+        async def record_all(change):
+            everything.append((change.task.title, change.new_status))
+
+        async def record_smith(change):
+            await asyncio.sleep(0)
+            smith_only.append((change.old_status, change.new_status))
+
+        async def scenario():
+            bus = TaskEventBus()
+            bus.subscribe(record_all)
+            bus.subscribe(record_smith, self.smith)
+            async with bus:
+                self.design.assign_to_student(self.alice)
+                self.alice.complete_task(self.design)
+                self.review.update_status("Completed")
+                await bus.drain()
+
+        asyncio.run(scenario())
+        self.assertEqual(
+            [
+                ("Design", "In Progress"),
+                ("Design", "Completed"),
+                ("Review", "Completed"),
+            ],
+            everything,
+        )
+        self.assertEqual(
+            [("Pending", "In Progress"), ("In Progress", "Completed")], smith_only
+        )
+
+    def test_changes_from_other_threads(self):
+        received = []
+
+        async def record(change):
+            received.append(change.task)
+
+        async def scenario():
+            bus = TaskEventBus()
+            bus.subscribe(record)
+            async with bus:
+                thread = threading.Thread(
+                    target=self.review.update_status, args=("Completed",)
+                )
+                thread.start()
+                thread.join()
+                await asyncio.sleep(0.01)
+                await bus.drain()
+
+        asyncio.run(scenario())
+        self.assertEqual([self.review], received)
+
+    def test_bad_subscribers_do_not_stop_the_bus(self):
+        received = []
+
+        async def failing(change):
+            raise RuntimeError("subscriber failed")
+
+        def not_a_coroutine(change):
+            pass
+
+        async def record(change):
+            received.append(change.new_status)
+
+        async def scenario():
+            bus = TaskEventBus()
+            for callback in (failing, not_a_coroutine, record):
+                bus.subscribe(callback)
+            async with bus:
+                self.review.update_status("In Progress")
+                await bus.drain()
+                self.review.update_status("Completed")
+            return bus.failed
+
+        self.assertEqual(4, asyncio.run(scenario()))
+        self.assertEqual(["In Progress", "Completed"], received)
+
+    def test_full_queue_drops_changes(self):
+        async def scenario():
+            async with TaskEventBus(maxsize=1) as bus:
+                self.review.update_status("In Progress")
+                self.review.update_status("Completed")
+            return bus.dropped
+
+        self.assertEqual(1, asyncio.run(scenario()))
+
+    def test_bus_left_running_after_its_loop_closed(self):
+        async def scenario():
+            bus = TaskEventBus()
+            await bus.start()
+            return bus
+
+        bus = asyncio.run(scenario())
+        self.assertTrue(self.review.update_status("Completed"))
+        self.assertEqual("Completed", self.review.status)
+        self.assertTrue(self.review.update_status("Pending"))
+        self.assertEqual(1, bus.dropped)
+
+
+if __name__ == "__main__":
+    unittest.main()
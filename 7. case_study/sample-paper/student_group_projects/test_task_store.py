@@ -0,0 +1,108 @@
+import unittest
+from datetime import date, datetime, timedelta, timezone
+
+from canva_example_class import Group, Student, Supervisor
+from task_store import TaskStore
+
+
+class TestTaskStore(unittest.TestCase):
+    def setUp(self):
+        self.smith = Supervisor("Dr. Smith", "smith@university.edu")
+        self.jones = Supervisor("Dr. Jones", "jones@university.edu")
+        self.alpha = Group("Team Alpha", "", self.smith)
+        self.beta = Group("Team Beta", "", self.jones)
+        self.alice = Student("Alice", "alice@university.edu")
+        self.alpha.add_student(self.alice)
+        self.late, self.done, self.due = self.alpha.create_tasks(
+            [
+                ("Late", "", datetime(2030, 1, 1)),
+                ("Done", "", datetime(2030, 1, 2)),
+                ("Due", "", datetime(2030, 1, 9)),
+            ]
+        )
+        self.done.update_status("Completed")
+        self.other = self.beta.create_task("Other", "", datetime(2030, 1, 3))
+        self.store = TaskStore.from_supervisors([self.smith, self.jones])
+
+    def test_from_supervisors(self):
+        self.assertEqual(4, len(self.store))
+        self.assertEqual(0, len(TaskStore()))
+        self.assertEqual("Completed", self.store.frame.at[self.done.id, "status"])
+
+    def test_sync_task(self):
+        self.late.assign_to_student(self.alice)
+        self.store.sync_task(self.late)
+        self.assertEqual("In Progress", self.store.frame.at[self.late.id, "status"])
+        self.assertEqual(1, self.store.frame.at[self.late.id, "assignee_count"])
+        with self.assertRaises(KeyError):
+            self.store.sync_task(self.alpha.create_task("New", ""))
+
+    def test_sync_task_copies_deadline(self):
+        self.due.set_deadline(datetime(2030, 1, 4))
+        self.store.sync_task(self.due)
+        overdue = self.store.overdue_per_group(now=datetime(2030, 1, 5))
+        self.assertEqual(2, overdue[self.alpha.id])
+        self.due.set_deadline(None)
+        self.store.sync_task(self.due)
+        overdue = self.store.overdue_per_group(now=datetime(2030, 1, 5))
+        self.assertEqual(1, overdue[self.alpha.id])
+
+    def test_add_task(self):
+        task = self.alpha.create_task("New", "", date(2030, 1, 4))
+        self.store.add_task(task)
+        self.assertEqual(5, len(self.store))
+        self.assertEqual("Pending", self.store.frame.at[task.id, "status"])
+        self.assertEqual(
+            {self.alpha.id: 2, self.beta.id: 1},
+            self.store.overdue_per_group(now=datetime(2030, 1, 5)).to_dict(),
+        )
+        task.update_status("Completed")
+        self.store.add_task(task)
+        self.assertEqual(5, len(self.store))
+        self.assertEqual("Completed", self.store.frame.at[task.id, "status"])
+        empty = TaskStore()
+        empty.add_task(task)
+        self.assertEqual(
+            [task.id],
+            list(empty.due_between(date(2030, 1, 1), date(2030, 1, 5))["task_id"]),
+        )
+
+    def test_mixed_deadlines(self):
+        plus_two = timezone(timedelta(hours=2))
+        self.late.set_deadline(date(2030, 1, 1))
+        self.other.set_deadline(datetime(2030, 1, 4, 1, tzinfo=plus_two))
+        store = TaskStore.from_supervisors([self.smith, self.jones])
+        # the aware deadline is 2030-01-03 23:00 UTC
+        self.assertEqual(
+            {self.alpha.id: 1, self.beta.id: 1},
+            store.overdue_per_group(now=datetime(2030, 1, 3, 23, 30)).to_dict(),
+        )
+        due = store.due_between(
+            datetime(2030, 1, 4, tzinfo=plus_two), datetime(2030, 1, 4)
+        )
+        self.assertEqual([self.other.id], list(due["task_id"]))
+        later = datetime(2031, 1, 1, tzinfo=timezone.utc)
+        self.assertEqual(3, store.overdue_per_group(now=later).sum())
+        self.assertEqual(0, store.overdue_per_group().sum())
+
+    def test_overdue_per_group(self):
+        overdue = self.store.overdue_per_group(now=datetime(2030, 1, 5))
+        self.assertEqual({self.alpha.id: 1, self.beta.id: 1}, overdue.to_dict())
+
+    def test_completion_rate_per_supervisor(self):
+        rates = self.store.completion_rate_per_supervisor()
+        self.assertAlmostEqual(1 / 3, rates[self.smith.id])
+        self.assertEqual(0, rates[self.jones.id])
+
+    def test_due_between(self):
+        due = self.store.due_between(datetime(2030, 1, 2), datetime(2030, 1, 9))
+        self.assertEqual([self.done.id, self.other.id], list(due["task_id"]))
+
+    def test_due_this_week(self):
+        # 2030-01-09 is a Wednesday; its week runs from the 7th to the 13th
+        due = self.store.due_this_week(now=datetime(2030, 1, 9, 12))
+        self.assertEqual([self.due.id], list(due["task_id"]))
+
+
+if __name__ == "__main__":
+    unittest.main()